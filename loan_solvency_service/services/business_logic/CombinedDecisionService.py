@@ -0,0 +1,55 @@
+from spyne.decorator import srpc
+from spyne.model.primitive import Integer, Decimal, Boolean
+from loan_solvency_service.shared.base_service import SoaServiceBase
+from loan_solvency_service.shared.datamodels import DecisionWithExplanations
+from loan_solvency_service.services.business_logic.SolvencyDecisionService import (
+    SolvencyDecisionService,
+)
+from loan_solvency_service.services.business_logic.ExplanationService import (
+    ExplanationService,
+)
+
+
+class CombinedDecisionService(SoaServiceBase):
+    """
+    DecideSolvency and Explain in a single call.
+    Both only need the score and client data, so the orchestrator can get the
+    decision and its explanations in one round trip.
+    """
+
+    @srpc(
+        Decimal,
+        Decimal,
+        Integer,
+        Decimal,
+        Integer,
+        Boolean,
+        _returns=DecisionWithExplanations,
+    )
+    def DecideAndExplain(
+        monthly_income,
+        monthly_expenses,
+        credit_score,
+        debt,
+        late_payments,
+        has_bankruptcy,
+    ):
+        """
+        DecideAndExplain(monthlyIncome, monthlyExpenses, score, debt, latePayments, hasBankruptcy)
+            -> DecisionWithExplanations
+
+        Same results as DecideSolvency followed by Explain.
+        """
+        return DecisionWithExplanations(
+            solvency_status=SolvencyDecisionService.DecideSolvency(
+                monthly_income, monthly_expenses, credit_score
+            ),
+            explanations=ExplanationService.Explain(
+                credit_score,
+                monthly_income,
+                monthly_expenses,
+                debt,
+                late_payments,
+                has_bankruptcy,
+            ),
+        )
@@ -1,6 +1,29 @@
+import math
 from spyne.decorator import srpc
+from spyne.model.complex import Array
 from spyne.model.primitive import Integer, Decimal, Boolean
-from loan_solvency_service.shared.base_service import SoaServiceBase
+from loan_solvency_service.shared.base_service import (
+    SoaServiceBase,
+    ClientValidationError,
+)
+
+
+def compute_credit_score(debt, late_payments, has_bankruptcy):
+    """Apply the credit score formula to one credit history. Returns 0-1000."""
+    # Apply the mandatory formula in integer thousandths of a point
+    # (debt in cents), which avoids the Decimal -> float conversion:
+    # 1000 * score = 1000000 - debt_cents - 50000*late - 200000*bankruptcy
+    # Sub-cent debt is rounded up, so truncating the result still lowers
+    # the score as the exact formula does (0.001 debt -> 999, not 1000)
+    score_milli = (
+        1_000_000
+        - math.ceil(debt * 100)
+        - 50_000 * late_payments
+        - (200_000 if has_bankruptcy else 0)
+    )
+
+    # Truncate and clamp score to valid range [0, 1000]
+    return 0 if score_milli <= 0 else min(score_milli // 1000, 1000)
 
 
 class CreditScoringService(SoaServiceBase):
@@ -16,17 +39,48 @@ class CreditScoringService(SoaServiceBase):
 
         Returns credit score between 0-1000 based on credit history.
         """
-        # Apply the mandatory formula
-        score = 1000 - (0.1 * float(debt)) - (50 * late_payments)
-
-        if has_bankruptcy:
-            score -= 200
-
-        # Clamp score to valid range [0, 1000]
-        score = max(0, min(1000, int(score)))
+        score = compute_credit_score(debt, late_payments, has_bankruptcy)
 
         SoaServiceBase.log_info(
-            f"Credit score computed: {score} (debt={debt}, late={late_payments}, bankruptcy={has_bankruptcy})"
+            "Credit score computed: %s (debt=%s, late=%s, bankruptcy=%s)",
+            score,
+            debt,
+            late_payments,
+            has_bankruptcy,
         )
 
         return score
+
+    @srpc(
+        Array(Decimal),
+        Array(Integer),
+        Array(Boolean),
+        _returns=Array(Integer),
+        _faults=[ClientValidationError],
+    )
+    def ComputeCreditScoreBatch(debts, late_payments, has_bankruptcies):
+        """
+        ComputeCreditScoreBatch(debts[], latePayments[], hasBankruptcies[]) -> scores[]
+
+        Scores many credit histories in one call (e.g. portfolio re-scoring).
+        The three arrays are read position by position and must be the same length.
+        """
+        debts = debts or []
+        late_payments = late_payments or []
+        has_bankruptcies = has_bankruptcies or []
+
+        if not len(debts) == len(late_payments) == len(has_bankruptcies):
+            raise ClientValidationError(
+                detail=f"Batch arrays differ in length: debts={len(debts)}, "
+                f"late_payments={len(late_payments)}, "
+                f"has_bankruptcies={len(has_bankruptcies)}"
+            )
+
+        scores = [
+            compute_credit_score(debt, late, bankruptcy)
+            for debt, late, bankruptcy in zip(debts, late_payments, has_bankruptcies)
+        ]
+
+        SoaServiceBase.log_info("Credit scores computed for %d clients", len(scores))
+
+        return scores
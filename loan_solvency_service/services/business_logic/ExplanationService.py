@@ -1,8 +1,40 @@
+from bisect import bisect_right
 from spyne.decorator import srpc
 from spyne.model.primitive import Integer, Decimal, Boolean
 from loan_solvency_service.shared.base_service import SoaServiceBase
 from loan_solvency_service.shared.datamodels import Explanations
 
+# Explanation templates, indexed by band (lowest band first)
+_SCORE_THRESHOLDS = (500, 700, 800)
+_SCORE_TEMPLATES = (
+    "Poor credit score of {score}. High credit risk.",
+    "Fair credit score of {score}. Moderate credit risk.",
+    "Good credit score of {score}. Acceptable credit risk.",
+    "Excellent credit score of {score}. Strong creditworthiness.",
+)
+
+_INCOME_TEMPLATES = (
+    "Negative cash flow of ${net:.2f} per month. Expenses exceed income.",
+    "Break-even situation. Income exactly matches expenses.",
+    "Tight budget with only ${net:.2f} monthly surplus.",
+    "Strong financial position with ${net:.2f} monthly surplus.",
+)
+
+# Credit history phrases, indexed by has_bankruptcy
+_BANKRUPTCY_PARTS = ("no bankruptcy history", "bankruptcy on record")
+
+
+def _score_band(credit_score):
+    """Band index into _SCORE_TEMPLATES: <500, 500-699, 700-799, >=800."""
+    return bisect_right(_SCORE_THRESHOLDS, credit_score)
+
+
+def _income_band(net_income):
+    """Band index into _INCOME_TEMPLATES: deficit, break-even, <=1000, >1000."""
+    if net_income > 0:
+        return 3 if net_income > 1000 else 2
+    return 1 if net_income == 0 else 0
+
 
 class ExplanationService(SoaServiceBase):
     """
@@ -25,59 +57,30 @@ class ExplanationService(SoaServiceBase):
         """
 
         # 1. Credit Score Explanation
-        if credit_score >= 800:
-            score_explanation = (
-                f"Excellent credit score of {credit_score}. Strong creditworthiness."
-            )
-        elif credit_score >= 700:
-            score_explanation = (
-                f"Good credit score of {credit_score}. Acceptable credit risk."
-            )
-        elif credit_score >= 500:
-            score_explanation = (
-                f"Fair credit score of {credit_score}. Moderate credit risk."
-            )
-        else:
-            score_explanation = (
-                f"Poor credit score of {credit_score}. High credit risk."
-            )
+        score_explanation = _SCORE_TEMPLATES[_score_band(credit_score)].format(
+            score=credit_score
+        )
 
         # 2. Income vs Expenses Explanation
         net_income = monthly_income - monthly_expenses
-        if net_income > 1000:
-            income_explanation = (
-                f"Strong financial position with ${net_income:.2f} monthly surplus."
-            )
-        elif net_income > 0:
-            income_explanation = (
-                f"Tight budget with only ${net_income:.2f} monthly surplus."
-            )
-        elif net_income == 0:
-            income_explanation = (
-                "Break-even situation. Income exactly matches expenses."
-            )
-        else:
-            income_explanation = f"Negative cash flow of ${abs(net_income):.2f} per month. Expenses exceed income."
+        income_explanation = _INCOME_TEMPLATES[_income_band(net_income)].format(
+            net=abs(net_income)
+        )
 
         # 3. Credit History Explanation
-        history_parts = []
-
-        if debt > 0:
-            history_parts.append(f"${debt:.2f} in outstanding debt")
-        else:
-            history_parts.append("no outstanding debt")
-
-        if late_payments > 0:
-            history_parts.append(f"{late_payments} late payment(s)")
-        else:
-            history_parts.append("no late payments")
-
-        if has_bankruptcy:
-            history_parts.append("bankruptcy on record")
-        else:
-            history_parts.append("no bankruptcy history")
+        debt_part = (
+            f"${debt:.2f} in outstanding debt" if debt > 0 else "no outstanding debt"
+        )
+        late_part = (
+            f"{late_payments} late payment(s)"
+            if late_payments > 0
+            else "no late payments"
+        )
+        bankruptcy_part = _BANKRUPTCY_PARTS[bool(has_bankruptcy)]
 
-        history_explanation = f"Credit history shows {', '.join(history_parts)}."
+        history_explanation = (
+            f"Credit history shows {debt_part}, {late_part}, {bankruptcy_part}."
+        )
 
         explanations = Explanations(
             credit_score_explanation=score_explanation,
@@ -26,7 +26,11 @@ class SolvencyDecisionService(SoaServiceBase):
         status = SolvencyStatus(status=status_str)
 
         SoaServiceBase.log_info(
-            f"Solvency decision: {status_str} (income={monthly_income}, expenses={monthly_expenses}, score={credit_score})"
+            "Solvency decision: %s (income=%s, expenses=%s, score=%s)",
+            status_str,
+            monthly_income,
+            monthly_expenses,
+            credit_score,
         )
 
         return status
@@ -8,6 +8,9 @@ from loan_solvency_service.services.business_logic.SolvencyDecisionService impor
 from loan_solvency_service.services.business_logic.ExplanationService import (
     ExplanationService,
 )
+from loan_solvency_service.services.business_logic.CombinedDecisionService import (
+    CombinedDecisionService,
+)
 from loan_solvency_service.shared.base_service import start_spyne_server
 
 logger = logging.getLogger(__name__)
@@ -18,7 +21,7 @@ logging.basicConfig(
 
 def run_business_logic_services(port=8000):
     """
-    Starts the container that hosts all three business logic services.
+    Starts the container that hosts all business logic services.
     These are internal services used by the orchestrator.
     """
     interface_name = "BusinessLogic"
@@ -28,6 +31,7 @@ def run_business_logic_services(port=8000):
             CreditScoringService,
             SolvencyDecisionService,
             ExplanationService,
+            CombinedDecisionService,
         ],
         interface_name=interface_name,
         port=port,
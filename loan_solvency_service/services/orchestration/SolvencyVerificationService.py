@@ -1,18 +1,25 @@
 import os
 import time
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from spyne.decorator import srpc
+from spyne.model.primitive import Boolean
 from zeep.exceptions import Fault as ZeepFault
 from loan_solvency_service.shared.base_service import (
     ClientValidationError,
     SoaServiceBase,
     ClientNotFoundFault,
+    build_correlation_header,
     generate_correlation_id,
+    get_correlation_id,
+    run_with_correlation_id,
     set_correlation_id,
+    validate_client_id,
 )
 from loan_solvency_service.shared.datamodels import (
     ClientId,
     SolvencyReport,
-    SolvencyStatus,
 )
 from loan_solvency_service.shared.soap_client import InternalSoapClient
 
@@ -25,23 +32,55 @@ BUSINESS_SERVICE_URL = os.getenv(
     "BUSINESS_SERVICE_URL", "http://business:8000/BusinessLogic?wsdl"
 )
 
+# "1" = run the CRUD lookups in-process against DATABASE_URL instead of
+# calling the CRUD service over SOAP (single-process deployments only)
+CRUD_IN_PROCESS = os.getenv("CRUD_IN_PROCESS", "0") == "1"
+
 # **NEW: Cache configuration from environment**
 CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "300"))  # Default: 5 minutes
 CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "1000"))  # Default: 1000 entries
 
-# Initialize SOAP clients for internal services (lazy loading)
+# Initialize SOAP clients for internal services (lazy loading, created once)
 _crud_client = None
 _business_client = None
+_client_lock = threading.Lock()
 
 # **NEW: Initialize cache instance (global, shared across requests)**
 _crud_cache = TTLCache(ttl_seconds=CACHE_TTL_SECONDS, max_size=CACHE_MAX_SIZE)
 
+# Full SolvencyReports keyed by client_id; the pipeline is deterministic in them
+_report_cache = TTLCache(ttl_seconds=CACHE_TTL_SECONDS, max_size=CACHE_MAX_SIZE)
+
+# Key prefixes used by the cached CRUD helpers ({prefix}:{client_id})
+_CRUD_KEY_PREFIXES = ("identity", "financials", "history")
+
+# Worker pool for independent internal SOAP calls (shared across requests).
+# Each request thread (ORCHESTRATOR_MAX_THREADS) submits its 3 CRUD lookups
+# at once, so the default lets every request thread fan out without queueing
+CRUD_FANOUT_WORKERS = int(
+    os.getenv(
+        "CRUD_FANOUT_WORKERS", str(3 * int(os.getenv("ORCHESTRATOR_MAX_THREADS", "50")))
+    )
+)
+_crud_pool = ThreadPoolExecutor(
+    max_workers=CRUD_FANOUT_WORKERS, thread_name_prefix="soap-fanout"
+)
+
+
+def _submit(fn, *args, **kwargs):
+    """Run fn on the worker pool with the caller's correlation ID."""
+    return _crud_pool.submit(
+        run_with_correlation_id, get_correlation_id(), fn, *args, **kwargs
+    )
+
 
 def get_crud_client():
     """Get or create CRUD service client."""
     global _crud_client
     if _crud_client is None:
-        _crud_client = InternalSoapClient(CRUD_SERVICE_URL, "CRUDService")
+        with _client_lock:
+            if _crud_client is None:
+                _crud_client = InternalSoapClient(CRUD_SERVICE_URL, "CRUDService")
     return _crud_client
 
 
@@ -49,91 +88,159 @@ def get_business_client():
     """Get or create Business Logic service client."""
     global _business_client
     if _business_client is None:
-        _business_client = InternalSoapClient(
-            BUSINESS_SERVICE_URL, "BusinessLogicService"
-        )
+        with _client_lock:
+            if _business_client is None:
+                _business_client = InternalSoapClient(
+                    BUSINESS_SERVICE_URL, "BusinessLogicService"
+                )
     return _business_client
 
 
-# **NEW: Helper functions for cached CRUD calls**
-def get_client_identity_cached(client_id, correlation_id):
+def _local_crud_operations():
+    """Map CRUD operation names to their in-process implementations."""
+    from loan_solvency_service.services.crud.ClientDirectoryService import (
+        ClientDirectoryService,
+    )
+    from loan_solvency_service.services.crud.FinancialDataService import (
+        FinancialDataService,
+    )
+    from loan_solvency_service.services.crud.CreditBureauService import (
+        CreditBureauService,
+    )
+
+    return {
+        "GetClientIdentity": ClientDirectoryService.GetClientIdentity,
+        "GetClientFinancials": FinancialDataService.GetClientFinancials,
+        "GetClientCreditHistory": CreditBureauService.GetClientCreditHistory,
+    }
+
+
+def call_crud_operation(
+    operation_name, correlation_id, client_id, correlation_header=None
+):
     """
-    Get client identity with caching.
-    Cache key: identity:{client_id}
+    Call a CRUD operation, short-circuiting SOAP when CRUD runs in-process.
+    Returns (result, latency_ms) like InternalSoapClient.call_operation.
     """
-    cache_key = f"identity:{client_id}"
-
-    # Try cache first
-    cached_value = _crud_cache.get(cache_key)
-    if cached_value is not None:
-        SoaServiceBase.log_info(f"Cache HIT for {cache_key}", client_id)
-        SoaServiceBase.record_metrics(
-            "GetClientIdentity_cached", 0
-        )  # Zero latency for cache hit
-        return cached_value, 0
-
-    # Cache miss - call CRUD service
-    SoaServiceBase.log_info(f"Cache MISS for {cache_key}", client_id)
-    crud_client = get_crud_client()
-    result, latency = crud_client.call_operation(
-        "GetClientIdentity", correlation_id=correlation_id, client_id=client_id
-    )
+    if not CRUD_IN_PROCESS:
+        try:
+            return get_crud_client().call_operation(
+                operation_name,
+                correlation_id=correlation_id,
+                correlation_header=correlation_header,
+                client_id=client_id,
+            )
+        except ZeepFault as e:
+            # Surface not-found as our own fault so it can be cached
+            if "NotFound" in str(e.code or ""):
+                raise ClientNotFoundFault(detail=str(e.message or e))
+            raise
 
-    # Store in cache
-    _crud_cache.put(cache_key, result)
+    start_time = time.perf_counter_ns()
+    result = _local_crud_operations()[operation_name](client_id)
+    latency = (time.perf_counter_ns() - start_time) / 1_000_000
     return result, latency
 
 
-def get_client_financials_cached(client_id, correlation_id):
+# Cached marker for client IDs the CRUD service reported as not found
+_NOT_FOUND = object()
+
+
+def cached_crud(key_prefix, operation_name):
     """
-    Get client financials with caching.
-    Cache key: financials:{client_id}
+    Decorator for CRUD fetch helpers: serve (result, latency) from _crud_cache.
+    Cache key: {key_prefix}:{client_id}. Not-found outcomes are cached too, so
+    repeated lookups of unknown IDs don't reach the CRUD service.
     """
-    cache_key = f"financials:{client_id}"
-
-    # Try cache first
-    cached_value = _crud_cache.get(cache_key)
-    if cached_value is not None:
-        SoaServiceBase.log_info(f"Cache HIT for {cache_key}", client_id)
-        SoaServiceBase.record_metrics("GetClientFinancials_cached", 0)
-        return cached_value, 0
-
-    # Cache miss - call CRUD service
-    SoaServiceBase.log_info(f"Cache MISS for {cache_key}", client_id)
-    crud_client = get_crud_client()
-    result, latency = crud_client.call_operation(
-        "GetClientFinancials", correlation_id=correlation_id, client_id=client_id
+
+    cached_operation_name = f"{operation_name}_cached"
+
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        def wrapper(client_id, correlation_id, correlation_header=None):
+            cache_key = f"{key_prefix}:{client_id}"
+
+            # Try cache first
+            cached_value = _crud_cache.get(cache_key)
+            if cached_value is not None:
+                SoaServiceBase.log_info(
+                    "Cache HIT for %s", cache_key, client_id=client_id
+                )
+                SoaServiceBase.record_cache_hit(cached_operation_name)
+                if cached_value is _NOT_FOUND:
+                    raise ClientNotFoundFault(
+                        detail=f"Client with ID '{client_id}' not found in directory."
+                    )
+                return cached_value, 0
+
+            # Cache miss - call CRUD service and store the outcome
+            SoaServiceBase.log_info("Cache MISS for %s", cache_key, client_id=client_id)
+            try:
+                result, latency = fetch(client_id, correlation_id, correlation_header)
+            except ClientNotFoundFault:
+                _crud_cache.put(cache_key, _NOT_FOUND)
+                raise
+
+            _crud_cache.put(cache_key, result)
+            return result, latency
+
+        return wrapper
+
+    return decorator
+
+
+@cached_crud("identity", "GetClientIdentity")
+def get_client_identity_cached(client_id, correlation_id, correlation_header=None):
+    """Get client identity with caching. Cache key: identity:{client_id}"""
+    return call_crud_operation(
+        "GetClientIdentity", correlation_id, client_id, correlation_header
     )
 
-    # Store in cache
-    _crud_cache.put(cache_key, result)
-    return result, latency
+
+@cached_crud("financials", "GetClientFinancials")
+def get_client_financials_cached(client_id, correlation_id, correlation_header=None):
+    """Get client financials with caching. Cache key: financials:{client_id}"""
+    return call_crud_operation(
+        "GetClientFinancials", correlation_id, client_id, correlation_header
+    )
 
 
-def get_client_credit_history_cached(client_id, correlation_id):
+@cached_crud("history", "GetClientCreditHistory")
+def get_client_credit_history_cached(
+    client_id, correlation_id, correlation_header=None
+):
+    """Get client credit history with caching. Cache key: history:{client_id}"""
+    return call_crud_operation(
+        "GetClientCreditHistory", correlation_id, client_id, correlation_header
+    )
+
+
+def fetch_client_data(client_id, correlation_id, correlation_header=None):
     """
-    Get client credit history with caching.
-    Cache key: history:{client_id}
+    Fetch identity, financials and credit history for a client.
+    Remote CRUD calls run concurrently; in-process CRUD shares one DB row instead.
+
+    :return: [(identity, latency), (financials, latency), (history, latency)]
     """
-    cache_key = f"history:{client_id}"
-
-    # Try cache first
-    cached_value = _crud_cache.get(cache_key)
-    if cached_value is not None:
-        SoaServiceBase.log_info(f"Cache HIT for {cache_key}", client_id)
-        SoaServiceBase.record_metrics("GetClientCreditHistory_cached", 0)
-        return cached_value, 0
-
-    # Cache miss - call CRUD service
-    SoaServiceBase.log_info(f"Cache MISS for {cache_key}", client_id)
-    crud_client = get_crud_client()
-    result, latency = crud_client.call_operation(
-        "GetClientCreditHistory", correlation_id=correlation_id, client_id=client_id
+    fetchers = (
+        get_client_identity_cached,
+        get_client_financials_cached,
+        get_client_credit_history_cached,
     )
 
-    # Store in cache
-    _crud_cache.put(cache_key, result)
-    return result, latency
+    if CRUD_IN_PROCESS:
+        # Imported here so a remote-CRUD orchestrator never loads SQLAlchemy
+        from loan_solvency_service.shared.client_fetch import client_scope
+
+        with client_scope():
+            return [fetch(client_id, correlation_id) for fetch in fetchers]
+
+    get_crud_client()  # Connect before fanning out to the workers
+    futures = [
+        _submit(fetch, client_id, correlation_id, correlation_header)
+        for fetch in fetchers
+    ]
+    return [future.result() for future in futures]
 
 
 class SolvencyVerificationService(SoaServiceBase):
@@ -159,87 +266,89 @@ class SolvencyVerificationService(SoaServiceBase):
         # Generate correlation ID for this request
         correlation_id = generate_correlation_id()
         set_correlation_id(correlation_id)
+        # Built once, sent as a SOAP header on every internal call
+        correlation_header = build_correlation_header(correlation_id)
 
         # Track overall operation time
-        operation_start = time.time()
-
-        SoaServiceBase.log_info(
-            f"Starting solvency verification for client_id={client_id}", client_id
-        )
+        operation_start = time.perf_counter_ns()
 
         try:
+            validate_client_id(client_id)
+
+            # A cached report skips every CRUD and business logic call. It is
+            # counted as VerifySolvency_cached, without a latency sample, so
+            # hits don't drag down the VerifySolvency percentiles
+            cached_report = _report_cache.get(client_id)
+            if cached_report is not None:
+                SoaServiceBase.log_info(
+                    "Report cache HIT for %s", client_id, client_id=client_id
+                )
+                SoaServiceBase.record_cache_hit("VerifySolvency_cached")
+                return cached_report
+
+            SoaServiceBase.log_info(
+                "Starting solvency verification for client_id=%s",
+                client_id,
+                client_id=client_id,
+            )
+
             business_client = get_business_client()
 
             # **CHANGED: STEP 1 - Use cached CRUD calls**
-            SoaServiceBase.log_info("Fetching client data (with caching)", client_id)
-
-            # Call with cache
-            client_identity, latency1 = get_client_identity_cached(
-                client_id, correlation_id
+            SoaServiceBase.log_info(
+                "Fetching client data (with caching)", client_id=client_id
             )
+
+            # Call with cache (the three lookups are independent)
+            (
+                (client_identity, latency1),
+                (financials, latency2),
+                (credit_history, latency3),
+            ) = fetch_client_data(client_id, correlation_id, correlation_header)
+
             if latency1 > 0:  # Only record if not from cache
                 SoaServiceBase.record_metrics("GetClientIdentity", latency1)
-
-            financials, latency2 = get_client_financials_cached(
-                client_id, correlation_id
-            )
             if latency2 > 0:
                 SoaServiceBase.record_metrics("GetClientFinancials", latency2)
-
-            credit_history, latency3 = get_client_credit_history_cached(
-                client_id, correlation_id
-            )
             if latency3 > 0:
                 SoaServiceBase.record_metrics("GetClientCreditHistory", latency3)
 
             # **UNCHANGED: STEP 2 - Compute credit score (no caching for business logic)**
-            SoaServiceBase.log_info("Computing credit score", client_id)
+            SoaServiceBase.log_info("Computing credit score", client_id=client_id)
 
             credit_score, latency4 = business_client.call_operation(
                 "ComputeCreditScore",
                 correlation_id=correlation_id,
+                correlation_header=correlation_header,
                 debt=credit_history.debt,
                 late_payments=credit_history.late_payments,
                 has_bankruptcy=credit_history.has_bankruptcy,
             )
             SoaServiceBase.record_metrics("ComputeCreditScore", latency4)
 
-            # **UNCHANGED: STEP 3 - Make solvency decision**
-            SoaServiceBase.log_info("Making solvency decision", client_id)
-
-            solvency_status_response, latency5 = business_client.call_operation(
-                "DecideSolvency",
-                correlation_id=correlation_id,
-                monthly_income=financials.monthly_income,
-                monthly_expenses=financials.monthly_expenses,
-                credit_score=credit_score,
+            # **CHANGED: STEP 3 & 4 - Decide and explain in one call**
+            SoaServiceBase.log_info(
+                "Making solvency decision and generating explanations",
+                client_id=client_id,
             )
-            SoaServiceBase.record_metrics("DecideSolvency", latency5)
-
-            # Handle SOAP response
-            if isinstance(solvency_status_response, str):
-                status_value = solvency_status_response
-            elif hasattr(solvency_status_response, "status"):
-                status_value = solvency_status_response.status
-            else:
-                status_value = str(solvency_status_response)
-
-            solvency_status = SolvencyStatus(status=status_value)
-
-            # **UNCHANGED: STEP 4 - Generate explanations**
-            SoaServiceBase.log_info("Generating explanations", client_id)
 
-            explanations, latency6 = business_client.call_operation(
-                "Explain",
+            decision, latency5 = business_client.call_operation(
+                "DecideAndExplain",
                 correlation_id=correlation_id,
-                credit_score=credit_score,
+                correlation_header=correlation_header,
                 monthly_income=financials.monthly_income,
                 monthly_expenses=financials.monthly_expenses,
+                credit_score=credit_score,
                 debt=credit_history.debt,
                 late_payments=credit_history.late_payments,
                 has_bankruptcy=credit_history.has_bankruptcy,
             )
-            SoaServiceBase.record_metrics("Explain", latency6)
+            SoaServiceBase.record_metrics("DecideAndExplain", latency5)
+
+            # Reuse the decoded parts as-is rather than rebuilding ComplexModels
+            solvency_status = decision.solvency_status
+            explanations = decision.explanations
+            status_value = solvency_status.status
 
             # **UNCHANGED: STEP 5 - Assemble final report**
             report = SolvencyReport(
@@ -251,16 +360,21 @@ class SolvencyVerificationService(SoaServiceBase):
                 explanations=explanations,
             )
 
+            _report_cache.put(client_id, report)
+
             # Calculate total operation time
-            total_latency = (time.time() - operation_start) * 1000
+            total_latency = (time.perf_counter_ns() - operation_start) / 1_000_000
             SoaServiceBase.record_metrics("VerifySolvency", total_latency)
 
             # **NEW: Log cache statistics**
             cache_stats = _crud_cache.get_stats()
             SoaServiceBase.log_info(
-                f"Solvency verification completed: {status_value} "
-                f"(total: {total_latency:.2f}ms, cache hit rate: {cache_stats['hit_rate_percent']}%)",
-                client_id,
+                "Solvency verification completed: %s "
+                "(total: %.2fms, cache hit rate: %s%%)",
+                status_value,
+                total_latency,
+                cache_stats["hit_rate_percent"],
+                client_id=client_id,
             )
 
             return report
@@ -268,7 +382,7 @@ class SolvencyVerificationService(SoaServiceBase):
         except ZeepFault as e:
             # Handle SOAP faults from internal services and propagate them
             SoaServiceBase.log_error(
-                f"SOAP Fault from internal service: {e}", client_id
+                "SOAP Fault from internal service: %s", e, client_id=client_id
             )
 
             fault_code = str(e.code) if e.code else ""
@@ -282,25 +396,94 @@ class SolvencyVerificationService(SoaServiceBase):
                 raise ClientValidationError(detail=fault_message)
             else:
                 SoaServiceBase.log_error(
-                    f"Unknown SOAP fault: code={fault_code}, message={fault_message}",
-                    client_id,
+                    "Unknown SOAP fault: code=%s, message=%s",
+                    fault_code,
+                    fault_message,
+                    client_id=client_id,
                 )
                 raise
 
         except ClientNotFoundFault:
-            SoaServiceBase.log_error("Client not found during verification", client_id)
+            SoaServiceBase.log_error(
+                "Client not found during verification", client_id=client_id
+            )
             raise
         except ClientValidationError:
-            SoaServiceBase.log_error("Validation error during verification", client_id)
+            SoaServiceBase.log_error(
+                "Validation error during verification", client_id=client_id
+            )
             raise
         except Exception as e:
             SoaServiceBase.log_error(
-                f"Unexpected error during verification: {e}", client_id
+                "Unexpected error during verification: %s", e, client_id=client_id
             )
             raise
 
+    @srpc(
+        ClientId.customize(max_occurs="unbounded"),
+        _returns=SolvencyReport.customize(max_occurs="unbounded"),
+        _faults=[ClientNotFoundFault, ClientValidationError],
+    )
+    def VerifySolvencyBatch(client_ids):
+        """
+        VerifySolvencyBatch(clientId*) -> SolvencyReport*
+
+        Verify several clients in one SOAP call; reports come back in the
+        order of client_ids. With in-process CRUD, all their rows are loaded in
+        a single query. Fails as a whole if any client is unknown or invalid.
+        """
+        client_ids = list(client_ids or ())
+        batch_start = time.perf_counter_ns()
+
+        if CRUD_IN_PROCESS:
+            from loan_solvency_service.shared.client_fetch import (
+                client_scope,
+                prefetch_clients,
+            )
+
+            with client_scope():
+                prefetch_clients(client_ids)
+                reports = [
+                    SolvencyVerificationService.VerifySolvency(client_id)
+                    for client_id in client_ids
+                ]
+        else:
+            reports = [
+                SolvencyVerificationService.VerifySolvency(client_id)
+                for client_id in client_ids
+            ]
+
+        SoaServiceBase.record_metrics(
+            "VerifySolvencyBatch", (time.perf_counter_ns() - batch_start) / 1_000_000
+        )
+        return reports
+
+    @srpc(ClientId, _returns=Boolean, _faults=[ClientValidationError])
+    def InvalidateClient(client_id):
+        """
+        InvalidateClient(clientId) -> boolean
+
+        Drop the cached report and CRUD results for a client, e.g. after its
+        data changed. Returns True if anything was cached for it.
+        """
+        validate_client_id(client_id)
+
+        removed = _report_cache.invalidate(client_id)
+        for prefix in _CRUD_KEY_PREFIXES:
+            removed = _crud_cache.invalidate(f"{prefix}:{client_id}") or removed
+
+        SoaServiceBase.log_info(
+            "Cache invalidated (entries found: %s)", removed, client_id=client_id
+        )
+        return removed
+
 
 # **NEW: Helper to get cache instance (for metrics endpoint)**
 def get_cache_instance():
     """Get the global cache instance for metrics reporting."""
     return _crud_cache
+
+
+def get_cache_stats():
+    """Stats of the CRUD and report caches by name, for the metrics endpoints."""
+    return {"crud": _crud_cache.get_stats(), "report": _report_cache.get_stats()}
@@ -1,4 +1,5 @@
 import logging
+import os
 from loan_solvency_service.services.orchestration.SolvencyVerificationService import (
     SolvencyVerificationService,
 )
@@ -22,6 +23,8 @@ def run_orchestrator(port=8000):
         interface_name=interface_name,
         port=port,
         tns_suffix="",
+        # Requests mostly wait on internal SOAP calls, so allow more in flight
+        max_threads=int(os.getenv("ORCHESTRATOR_MAX_THREADS", "50")),
     )
 
 
@@ -1,9 +1,15 @@
 import logging
-import uuid
 import os
 import re
-import contextvars
 import json
+import threading
+
+from lxml import etree
+
+try:
+    import orjson  # Optional: faster /metrics serialization
+except ImportError:
+    orjson = None
 
 from spyne.application import Application
 from spyne.server.wsgi import WsgiApplication
@@ -15,7 +21,9 @@ from twisted.web.server import Site
 from twisted.internet import reactor
 from twisted.web.resource import Resource
 from twisted.web.wsgi import WSGIResource
-from twisted.internet import endpoints
+from twisted.internet.task import LoopingCall
+
+from loan_solvency_service.shared.minimal_server import listen_tcp
 
 # Import metrics collector
 from loan_solvency_service.shared.metrics import (
@@ -29,8 +37,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Context variable for correlation ID (thread-safe)
-correlation_id_context = contextvars.ContextVar("correlation_id", default=None)
+# Correlation ID of the request running on the current thread. Each request
+# stays on one WSGI worker thread, and _adopt_correlation_id resets it at the
+# start of every request, so a thread-local is enough (and cheaper than a
+# ContextVar). Worker pools hand it over with run_with_correlation_id.
+_cid_local = threading.local()
+
+# SOAP header element carrying the correlation ID between services
+CORRELATION_ID_HEADER = "{urn:solvency.verification.service:v1}CorrelationId"
 
 
 # --- Custom Faults (Required by 5.1 & 5.2) ---
@@ -62,22 +76,60 @@ class ClientValidationError(Fault):
 
 
 def generate_correlation_id():
-    """Generate a unique correlation ID for request tracing."""
-    return str(uuid.uuid4())
+    """
+    Generate a unique correlation ID for request tracing: 128 random bits
+    in the dashed 8-4-4-4-12 hex layout of a UUID, without building a UUID.
+    """
+    h = os.urandom(16).hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 
 def get_correlation_id():
-    """Get the current correlation ID from context."""
-    cid = correlation_id_context.get()
+    """Get the current thread's correlation ID, generating one if unset."""
+    cid = getattr(_cid_local, "cid", None)
     if cid is None:
-        cid = generate_correlation_id()
-        correlation_id_context.set(cid)
+        cid = _cid_local.cid = generate_correlation_id()
     return cid
 
 
 def set_correlation_id(cid):
-    """Set the correlation ID in context."""
-    correlation_id_context.set(cid)
+    """Set the current thread's correlation ID (None: generate on next use)."""
+    _cid_local.cid = cid
+
+
+def run_with_correlation_id(cid, fn, *args, **kwargs):
+    """Call fn with cid as the correlation ID, e.g. on a worker pool thread."""
+    _cid_local.cid = cid
+    return fn(*args, **kwargs)
+
+
+def build_correlation_header(cid):
+    """
+    Build the SOAP header element that propagates a correlation ID.
+    Build it once per request and pass it to every internal call.
+    """
+    header = etree.Element(CORRELATION_ID_HEADER)
+    header.text = cid
+    return header
+
+
+def _adopt_correlation_id(ctx):
+    """
+    Spyne 'method_call' listener: use the caller's correlation ID header
+    if present. Otherwise clear the previous request's ID, so a new one is
+    generated on first use (requests that never log don't pay for it).
+    """
+    cid = None
+    if ctx.in_header_doc is not None:
+        for element in ctx.in_header_doc:
+            if element.tag == CORRELATION_ID_HEADER:
+                cid = element.text
+                break
+    set_correlation_id(cid or None)
+
+
+# XSD pattern for client IDs, compiled once at import
+_match_client_id = re.compile(r"client-\d{3}").fullmatch
 
 
 def validate_client_id(client_id):
@@ -85,14 +137,29 @@ def validate_client_id(client_id):
     Validates client ID against the XSD pattern: client-\d{3}
     Raises ClientValidationError if invalid.
     """
-    pattern = r"^client-\d{3}$"
-    if not re.match(pattern, client_id):
+    if not _match_client_id(client_id):
         raise ClientValidationError(
             detail=f"Invalid client ID format: '{client_id}'. "
             f"Expected pattern: client-XXX (where XXX is 3 digits)"
         )
 
 
+def _log(level, message, args, client_id):
+    """
+    Log message at level behind a '[cid][client_id]: ' prefix.
+    The prefix values are passed as args, so all formatting is left to the
+    logging framework and happens only if a handler emits the record.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if client_id:
+        logger.log(
+            level, "[%s][%s]: " + message, get_correlation_id(), client_id, *args
+        )
+    else:
+        logger.log(level, "[%s]: " + message, get_correlation_id(), *args)
+
+
 # --- Base Service Class ---
 
 
@@ -103,18 +170,20 @@ class SoaServiceBase(ServiceBase):
     """
 
     @staticmethod
-    def log_info(message, client_id=None):
-        """Log info message with correlation ID and optional client_id tag"""
-        cid = get_correlation_id()
-        client_tag = f"[{client_id}]" if client_id else ""
-        logger.info(f"[{cid}]{client_tag}: {message}")
+    def log_info(message, *args, client_id=None):
+        """
+        Log info message with correlation ID and optional client_id tag.
+        message is always %-formatted (with args), so write '%%' for a literal %.
+        """
+        _log(logging.INFO, message, args, client_id)
 
     @staticmethod
-    def log_error(message, client_id=None):
-        """Log error message with correlation ID and optional client_id tag"""
-        cid = get_correlation_id()
-        client_tag = f"[{client_id}]" if client_id else ""
-        logger.error(f"[{cid}]{client_tag}: {message}")
+    def log_error(message, *args, client_id=None):
+        """
+        Log error message with correlation ID and optional client_id tag.
+        message is always %-formatted (with args), so write '%%' for a literal %.
+        """
+        _log(logging.ERROR, message, args, client_id)
 
     @staticmethod
     def record_metrics(operation_name, latency_ms):
@@ -122,33 +191,60 @@ class SoaServiceBase(ServiceBase):
         metrics = get_metrics_collector()
         metrics.record_call(operation_name, latency_ms)
 
+    @staticmethod
+    def record_cache_hit(operation_name):
+        """Record a call served from cache (counted, no latency sample)."""
+        metrics = get_metrics_collector()
+        metrics.record_cache_hit(operation_name)
+
 
 # --- Server Runner Utility ---
 
 
 def start_spyne_server(
-    service_classes, interface_name, port=8000, soap_protocol=Soap11, tns_suffix=""
+    service_classes,
+    interface_name,
+    port=8000,
+    soap_protocol=Soap11,
+    tns_suffix="",
+    max_threads=None,
+    strict_validation=None,
 ):
     """
     Configures and starts a Spyne service using the stable Twisted WSGI integration.
 
     :param service_classes: A list of Spyne ServiceBase classes to expose.
     :param interface_name: A descriptive name for the service interface (used as the URL path).
+    :param max_threads: Size of the WSGI thread pool, i.e. how many SOAP requests
+        are handled at once (default: 4 per CPU, between 10 and 64).
+    :param strict_validation: Validate incoming requests against the XSD with
+        lxml (default: SOAP_STRICT_VALIDATION=1 in the environment). Responses
+        are built by the services themselves and are never re-validated.
     """
+    if strict_validation is None:
+        strict_validation = os.getenv("SOAP_STRICT_VALIDATION", "0") == "1"
 
     # Initialize metrics collector with service name
-    get_metrics_collector(interface_name)
+    metrics = get_metrics_collector(interface_name)
 
     # 3.3: Protocol choice: SOAP 1.1
     # 3.3: Style: document/literal is the default for Spyne's Soap11/12
     application = Application(
         service_classes,
         tns=f"urn:solvency.verification.service:v1{tns_suffix}",
-        in_protocol=soap_protocol(validator="lxml"),
-        out_protocol=soap_protocol(validator="lxml"),
+        # Without strict validation, inputs are still checked explicitly
+        # (e.g. validate_client_id) and type-converted by Spyne
+        in_protocol=soap_protocol(validator="lxml" if strict_validation else None),
+        out_protocol=soap_protocol(),
     )
 
+    # Per-request correlation ID, propagated from the caller's SOAP header
+    application.event_manager.add_listener("method_call", _adopt_correlation_id)
+
     wsgi_application = WsgiApplication(application)
+    if not max_threads:
+        max_threads = min(max((os.cpu_count() or 1) * 4, 10), 64)
+    reactor.suggestThreadPoolSize(max_threads)
     wsgi_app = WSGIResource(reactor, reactor.getThreadPool(), wsgi_application)
 
     # Root Resource for general serving (including WSDL at ?wsdl)
@@ -160,7 +256,10 @@ def start_spyne_server(
 
     site = Site(root)
 
-    logger.info(f"[{interface_name}] Starting SOAP server on port {port}...")
+    logger.info(
+        f"[{interface_name}] Starting SOAP server on port {port} "
+        f"({max_threads} worker threads)..."
+    )
     logger.info(
         f"[{interface_name}] WSDL available at http://localhost:{port}/{interface_name}?wsdl"
     )
@@ -172,15 +271,21 @@ def start_spyne_server(
     )
 
     try:
-        endpoint = endpoints.TCP4ServerEndpoint(
-            reactor, port, interface=os.getenv("HOST", "0.0.0.0")
-        )
-        endpoint.listen(site)
+        listen_tcp(port, site, interface=os.getenv("HOST", "0.0.0.0"))
+        # Push buffered request metrics to Prometheus once a second
+        LoopingCall(metrics.flush_prometheus).start(1.0, now=False)
         reactor.run()
     except Exception as e:
         logger.error(f"Failed to start reactor: {e}")
 
 
+def _dump_json(data):
+    """Serialize data as indented JSON bytes, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
 # Internal health check
 class _HealthResource(Resource):
     """Simple resource to respond to a health check, used by docker-compose."""
@@ -189,10 +294,27 @@ class _HealthResource(Resource):
 
     def __init__(self, service_name):
         self.service_name = service_name
+        self._body = f"Service {service_name} is running and healthy.".encode("utf-8")
 
     def render_GET(self, request):
         request.setHeader(b"Content-Type", b"text/plain")
-        return f"Service {self.service_name} is running and healthy.".encode("utf-8")
+        return self._body
+
+
+def _resolve_cache_getter(service_name):
+    """
+    Look up the orchestrator's get_cache_stats once, when a metrics
+    resource is created. Returns None for services without a cache.
+    """
+    if service_name != "SolvencyVerification":
+        return None
+    try:
+        from loan_solvency_service.services.orchestration.SolvencyVerificationService import (
+            get_cache_stats,
+        )
+    except ImportError:
+        return None  # Cache not available on non-orchestrator services
+    return get_cache_stats
 
 
 # **UPDATED: JSON Metrics endpoint with cache stats**
@@ -203,29 +325,22 @@ class _MetricsResource(Resource):
 
     def __init__(self, service_name):
         self.service_name = service_name
+        self._get_cache_stats = _resolve_cache_getter(service_name)
 
     def render_GET(self, request):
         """Return metrics in JSON format."""
         metrics = get_metrics_collector()
 
-        # **NEW: Try to get cache stats if this is orchestrator**
+        # **NEW: Include cache stats if this is orchestrator**
         cache_stats = None
-        if self.service_name == "SolvencyVerification":
-            try:
-                from loan_solvency_service.services.orchestration.SolvencyVerificationService import (
-                    get_cache_instance,
-                )
-
-                cache = get_cache_instance()
-                cache_stats = cache.get_stats()
-            except ImportError:
-                pass  # Cache not available on non-orchestrator services
+        if self._get_cache_stats is not None:
+            cache_stats = self._get_cache_stats()
 
         metrics_data = metrics.get_metrics(cache_stats)
         metrics_data["service_name"] = self.service_name
 
         request.setHeader(b"Content-Type", b"application/json")
-        return json.dumps(metrics_data, indent=2).encode("utf-8")
+        return _dump_json(metrics_data)
 
 
 # Prometheus Metrics endpoint
@@ -236,26 +351,11 @@ class _PrometheusMetricsResource(Resource):
 
     def __init__(self, service_name):
         self.service_name = service_name
+        self._get_cache_stats = _resolve_cache_getter(service_name)
+        self._content_type = get_prometheus_content_type().encode("utf-8")
 
     def render_GET(self, request):
         """Return metrics in Prometheus format."""
-        metrics = get_metrics_collector()
-
-        # **NEW: Update cache metrics if available**
-        if self.service_name == "SolvencyVerification":
-            try:
-                from loan_solvency_service.services.orchestration.SolvencyVerificationService import (
-                    get_cache_instance,
-                )
-
-                cache = get_cache_instance()
-                cache_stats = cache.get_stats()
-                metrics.update_cache_metrics(cache_stats)
-            except ImportError:
-                pass
-
-        prometheus_data = metrics.get_prometheus_metrics()
-
-        content_type = get_prometheus_content_type()
-        request.setHeader(b"Content-Type", content_type.encode("utf-8"))
-        return prometheus_data
+        cache_stats = self._get_cache_stats() if self._get_cache_stats else None
+        request.setHeader(b"Content-Type", self._content_type)
+        return get_metrics_collector().scrape_prometheus(cache_stats)
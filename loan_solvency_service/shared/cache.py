@@ -1,22 +1,30 @@
 import time
 import threading
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Tuple
 from collections import OrderedDict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Number of independently locked shards (power of two, see TTLCache._shard)
+NUM_SHARDS = 16
 
-class CacheEntry:
-    """Represents a cached value with expiration time."""
 
-    def __init__(self, value: Any, ttl_seconds: int):
-        self.value = value
-        self.expiry_time = time.time() + ttl_seconds
+class _CacheShard:
+    """
+    One lock-protected LRU slice of a TTLCache, with its own counters.
+    Entries are stored as (value, expiry_time) tuples.
+    """
 
-    def is_expired(self) -> bool:
-        """Check if this cache entry has expired."""
-        return time.time() > self.expiry_time
+    __slots__ = ("lock", "entries", "max_size", "hits", "misses", "evictions")
+
+    def __init__(self, max_size: int):
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, Tuple[Any, float]] = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
 
 class TTLCache:
@@ -28,6 +36,10 @@ class TTLCache:
     - Maximum size with LRU eviction
     - Thread-safe operations
     - Hit/miss metrics tracking
+
+    Keys are spread over NUM_SHARDS shards, each with its own lock, so
+    concurrent requests rarely wait on each other. LRU order and the size
+    limit apply per shard (max_size / NUM_SHARDS entries each).
     """
 
     def __init__(self, ttl_seconds: int = 300, max_size: int = 1000):
@@ -39,16 +51,18 @@ class TTLCache:
         """
         self.ttl_seconds = ttl_seconds
         self.max_size = max_size
-        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
-        self._lock = threading.Lock()
 
-        # Metrics
-        self._hits = 0
-        self._misses = 0
-        self._evictions = 0
+        # Small caches keep a single shard so the size limit stays exact
+        num_shards = NUM_SHARDS if max_size >= NUM_SHARDS else 1
+        self._shards = [_CacheShard(max_size // num_shards) for _ in range(num_shards)]
+        self._shard_mask = num_shards - 1
 
         logger.info(f"Cache initialized: TTL={ttl_seconds}s, MaxSize={max_size}")
 
+    def _shard(self, key: str) -> _CacheShard:
+        """Shard responsible for key."""
+        return self._shards[hash(key) & self._shard_mask]
+
     def get(self, key: str) -> Optional[Any]:
         """
         Retrieve value from cache.
@@ -56,25 +70,27 @@ class TTLCache:
         :param key: Cache key
         :return: Cached value or None if not found/expired
         """
-        with self._lock:
-            if key not in self._cache:
-                self._misses += 1
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.misses += 1
                 return None
 
-            entry = self._cache[key]
+            value, expiry_time = entry
 
             # Check expiration
-            if entry.is_expired():
-                del self._cache[key]
-                self._misses += 1
-                logger.debug(f"Cache expired: {key}")
+            if time.time() > expiry_time:
+                del shard.entries[key]
+                shard.misses += 1
+                logger.debug("Cache expired: %s", key)
                 return None
 
             # Move to end (LRU)
-            self._cache.move_to_end(key)
-            self._hits += 1
-            logger.debug(f"Cache hit: {key}")
-            return entry.value
+            shard.entries.move_to_end(key)
+            shard.hits += 1
+            logger.debug("Cache hit: %s", key)
+            return value
 
     def put(self, key: str, value: Any) -> None:
         """
@@ -83,19 +99,20 @@ class TTLCache:
         :param key: Cache key
         :param value: Value to cache
         """
-        with self._lock:
+        shard = self._shard(key)
+        with shard.lock:
+            entries = shard.entries
             # Check size limit
-            if key not in self._cache and len(self._cache) >= self.max_size:
+            if key not in entries and len(entries) >= shard.max_size:
                 # Evict oldest entry (LRU)
-                oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
-                self._evictions += 1
-                logger.debug(f"Cache eviction: {oldest_key}")
+                oldest_key, _ = entries.popitem(last=False)
+                shard.evictions += 1
+                logger.debug("Cache eviction: %s", oldest_key)
 
             # Store new entry
-            self._cache[key] = CacheEntry(value, self.ttl_seconds)
-            self._cache.move_to_end(key)
-            logger.debug(f"Cache put: {key}")
+            entries[key] = (value, time.time() + self.ttl_seconds)
+            entries.move_to_end(key)
+            logger.debug("Cache put: %s", key)
 
     def invalidate(self, key: str) -> bool:
         """
@@ -104,18 +121,19 @@ class TTLCache:
         :param key: Cache key to invalidate
         :return: True if key was found and removed
         """
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                logger.debug(f"Cache invalidated: {key}")
+        shard = self._shard(key)
+        with shard.lock:
+            if shard.entries.pop(key, None) is not None:
+                logger.debug("Cache invalidated: %s", key)
                 return True
             return False
 
     def clear(self) -> None:
         """Clear all cache entries."""
-        with self._lock:
-            self._cache.clear()
-            logger.info("Cache cleared")
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+        logger.info("Cache cleared")
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -123,20 +141,27 @@ class TTLCache:
 
         :return: Dictionary with cache metrics
         """
-        with self._lock:
-            total_requests = self._hits + self._misses
-            hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
-
-            return {
-                "size": len(self._cache),
-                "max_size": self.max_size,
-                "ttl_seconds": self.ttl_seconds,
-                "hits": self._hits,
-                "misses": self._misses,
-                "evictions": self._evictions,
-                "hit_rate_percent": round(hit_rate, 2),
-                "total_requests": total_requests,
-            }
+        size = hits = misses = evictions = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.entries)
+                hits += shard.hits
+                misses += shard.misses
+                evictions += shard.evictions
+
+        total_requests = hits + misses
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate_percent": round(hit_rate, 2),
+            "total_requests": total_requests,
+        }
 
     def cleanup_expired(self) -> int:
         """
@@ -144,15 +169,21 @@ class TTLCache:
 
         :return: Number of entries removed
         """
-        with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items() if entry.is_expired()
-            ]
-
-            for key in expired_keys:
-                del self._cache[key]
-
-            if expired_keys:
-                logger.debug(f"Cleaned up {len(expired_keys)} expired entries")
-
-            return len(expired_keys)
+        now = time.time()
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired_keys = [
+                    key
+                    for key, (_, expiry_time) in shard.entries.items()
+                    if now > expiry_time
+                ]
+
+                for key in expired_keys:
+                    del shard.entries[key]
+                removed += len(expired_keys)
+
+        if removed:
+            logger.debug("Cleaned up %d expired entries", removed)
+
+        return removed
@@ -0,0 +1,168 @@
+import contextvars
+from contextlib import contextmanager
+
+from spyne.decorator import srpc
+from sqlalchemy import bindparam, select
+
+from loan_solvency_service.shared import db_setup
+from loan_solvency_service.shared.base_service import (
+    SoaServiceBase,
+    ClientNotFoundFault,
+    ClientValidationError,
+    validate_client_id,
+)
+from loan_solvency_service.shared.datamodels import ClientId, map_client_to_models
+from loan_solvency_service.shared.db_setup import Client
+
+# Built once; SQLAlchemy caches its compiled form, only the bound ID changes
+_client_by_id = select(Client).where(Client.client_id == bindparam("client_id"))
+
+# Request-scoped cache of Client rows keyed by client_id (None = no active scope)
+_client_rows = contextvars.ContextVar("client_rows", default=None)
+
+# Same scope: the (identity, financials, history) models mapped from each row
+_client_models = contextvars.ContextVar("client_models", default=None)
+
+
+class CrudServiceBase(SoaServiceBase):
+    """
+    Base class for the CRUD services.
+    Releases the worker thread's scoped DB session once each SOAP call ends.
+    """
+
+    @classmethod
+    def call_wrapper(cls, ctx, args=None):
+        try:
+            return super(CrudServiceBase, cls).call_wrapper(ctx, args)
+        finally:
+            db_setup.SessionLocal.remove()
+
+
+@contextmanager
+def client_scope():
+    """
+    Open a request scope in which each client row is fetched at most once.
+    Identity, financials and credit history lookups then share a single query.
+    Inside an already open scope this joins it (e.g. a batch of verifications).
+    """
+    if _client_rows.get() is not None:
+        yield
+        return
+
+    rows_token = _client_rows.set({})
+    models_token = _client_models.set({})
+    try:
+        yield
+    finally:
+        _client_models.reset(models_token)
+        _client_rows.reset(rows_token)
+
+
+def prefetch_clients(client_ids):
+    """
+    Load the rows for several clients with one query into the current scope,
+    so their later get_client calls don't query again. No-op without a scope.
+    """
+    rows = _client_rows.get()
+    if rows is None:
+        return
+
+    missing = [client_id for client_id in client_ids if client_id not in rows]
+    if not missing:
+        return
+
+    # Unknown IDs are remembered as None, like a single failed lookup
+    rows.update(dict.fromkeys(missing))
+    with db_setup.SessionLocal() as db:
+        for client in db.scalars(select(Client).where(Client.client_id.in_(missing))):
+            rows[client.client_id] = client
+
+
+def _fetch_client(client_id):
+    """Look up a client by primary key. Returns None if not found."""
+    with db_setup.SessionLocal() as db:
+        return db.execute(_client_by_id, {"client_id": client_id}).scalar_one_or_none()
+
+
+def get_client(client_id):
+    """
+    Get the Client row for client_id, reusing the row fetched earlier in the
+    current request scope if any. Returns None if the client does not exist.
+    """
+    rows = _client_rows.get()
+    if rows is None:
+        return _fetch_client(client_id)
+
+    if client_id not in rows:
+        rows[client_id] = _fetch_client(client_id)
+    return rows[client_id]
+
+
+def get_client_models(client_id):
+    """
+    Get the (identity, financials, history) models for client_id, mapping
+    its row only once per request scope. All three are None if the client
+    does not exist.
+    """
+    models = _client_models.get()
+    if models is None:
+        return map_client_to_models(get_client(client_id))
+
+    if client_id not in models:
+        models[client_id] = map_client_to_models(get_client(client_id))
+    return models[client_id]
+
+
+def make_crud_service(name, operation_name, return_model, part_index, label, doc):
+    """
+    Build a CRUD service class exposing one lookup operation.
+    The three CRUD services only differ in which part of the client row they
+    return, so they share this single implementation.
+
+    :param name: Service class name (also the Spyne service name)
+    :param operation_name: SOAP operation name, e.g. GetClientIdentity
+    :param return_model: ComplexModel returned by the operation
+    :param part_index: Index of that model in map_client_to_models' result
+    :param label: What is retrieved, used in log messages
+    :param doc: Operation docstring
+    """
+
+    def lookup(client_id):
+        validate_client_id(client_id)
+
+        # Shared fetch: one query and one mapping per client per request scope
+        part = get_client_models(client_id)[part_index]
+
+        if part is None:
+            SoaServiceBase.log_error(
+                "Client ID not found for %s: %s", label, client_id, client_id=client_id
+            )
+            # 5.1: Raise SOAP Fault Client.NotFound
+            raise ClientNotFoundFault(
+                detail=f"Client with ID '{client_id}' not found in directory."
+            )
+
+        SoaServiceBase.log_info(
+            "%s retrieved for %s", label.capitalize(), client_id, client_id=client_id
+        )
+        return part
+
+    lookup.__name__ = operation_name
+    lookup.__qualname__ = f"{name}.{operation_name}"
+    lookup.__doc__ = doc
+
+    operation = srpc(
+        ClientId,
+        _returns=return_model,
+        _faults=[ClientNotFoundFault, ClientValidationError],
+    )(lookup)
+
+    return type(
+        name,
+        (CrudServiceBase,),
+        {
+            "__doc__": f"2.1: {name} - Retrieves client {label}.",
+            "__module__": CrudServiceBase.__module__,
+            operation_name: operation,
+        },
+    )
@@ -61,6 +61,14 @@ class Explanations(ComplexModel):
     credit_history_explanation = Unicode
 
 
+class DecisionWithExplanations(ComplexModel):
+    """SolvencyStatus and Explanations returned together by DecideAndExplain"""
+
+    __namespace__ = "urn:solvency.verification.service:datatypes:v1"
+    solvency_status = SolvencyStatus
+    explanations = Explanations
+
+
 class SolvencyReport(ComplexModel):
     """3.1: SolvencyReport (aggregation)"""
 
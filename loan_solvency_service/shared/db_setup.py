@@ -2,13 +2,15 @@ import os
 from sqlalchemy import (
     CheckConstraint,
     create_engine,
+    insert,
     Column,
     String,
     Numeric,
     Integer,
     Boolean,
 )
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker, declarative_base
 from sqlalchemy.exc import SQLAlchemyError
 
 # Get DB connection string from environment variable (set in docker-compose.yml)
@@ -62,16 +64,41 @@ class Client(Base):
 
 
 # --- 2. Database Connection and Setup ---
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _pool_options(database_url):
+    """
+    Connection pool settings for server databases (PostgreSQL).
+    Sized for the CRUD service's worker threads; pre-ping and recycling
+    replace connections dropped by a database restart or idle timeout.
+    SQLite keeps SQLAlchemy's defaults.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        # Reuse the most recently returned connection, keeping idle ones cold
+        "pool_use_lifo": True,
+    }
+
+
+engine = create_engine(DATABASE_URL, **_pool_options(DATABASE_URL))
+# Thread-local sessions: each Twisted worker thread reuses its own session
+# (and pooled connection) until SessionLocal.remove() is called.
+SessionLocal = scoped_session(
+    sessionmaker(autocommit=False, autoflush=False, bind=engine)
+)
 
 
 def create_db_and_tables():
-    """Create all tables defined in Base."""
+    """
+    Create all tables defined in Base (existing tables are left untouched).
+    Set RESET_DB=1 to drop and recreate them first, e.g. for a clean test run.
+    """
     try:
-        # Drops and creates tables. Use Base.metadata.create_all(engine) for production.
-        # We use drop_all for easy testing reset.
-        Base.metadata.drop_all(engine)
+        if os.getenv("RESET_DB", "0") == "1":
+            Base.metadata.drop_all(engine)
         Base.metadata.create_all(engine)
         print("Database tables created successfully.")
     except SQLAlchemyError as e:
@@ -87,34 +114,31 @@ TEST_DATA = [
 ]
 
 
+_CLIENT_COLUMNS = (
+    "client_id",
+    "name",
+    "address",
+    "monthly_income",
+    "monthly_expenses",
+    "debt",
+    "late_payments",
+    "has_bankruptcy",
+)
+
+
 def insert_test_data():
     """Insert the mandatory test data into the clients table."""
-    db = SessionLocal()
+    # Map the tuple data to column dicts
+    rows = [dict(zip(_CLIENT_COLUMNS, d)) for d in TEST_DATA]
+
     try:
-        # Map the tuple data to Client model objects
-        clients = [
-            Client(
-                client_id=d[0],
-                name=d[1],
-                address=d[2],
-                monthly_income=d[3],
-                monthly_expenses=d[4],
-                debt=d[5],
-                late_payments=d[6],
-                has_bankruptcy=d[7],
-            )
-            for d in TEST_DATA
-        ]
-
-        # Insert or merge the data
-        db.bulk_save_objects(clients)
-        db.commit()
-        print(f"Successfully inserted {len(clients)} test clients.")
+        # One INSERT statement executed for all rows (executemany), no ORM
+        # objects; the transaction commits on exit or rolls back on error
+        with engine.begin() as conn:
+            conn.execute(insert(Client), rows)
+        print(f"Successfully inserted {len(rows)} test clients.")
     except SQLAlchemyError as e:
-        db.rollback()
         print(f"Error inserting test data: {e}")
-    finally:
-        db.close()
 
 
 # --- 4. Initialization Script ---
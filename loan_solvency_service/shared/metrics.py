@@ -1,16 +1,166 @@
 import time
 import threading
+from bisect import bisect_left
 from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
 
 # Prometheus imports
 from prometheus_client import (
     Counter,
-    Histogram,
     Gauge,
     generate_latest,
     CONTENT_TYPE_LATEST,
+    REGISTRY,
 )
+from prometheus_client.core import HistogramMetricFamily
+from prometheus_client.utils import floatToGoString
+
+# Upper bounds (ms) of the latency histogram buckets: 8 log-spaced buckets per
+# doubling from 0.01ms up to ~170s, so each bucket spans about 9%
+_LATENCY_BOUNDS_MS = tuple(0.01 * 2 ** (i / 8) for i in range(8 * 24))
+
+
+class LatencyHistogram:
+    """
+    Streaming latency aggregates for one operation.
+    Keeps count/sum/min/max and fixed bucket counts, so memory stays constant
+    and percentiles are read from the buckets instead of sorting every sample.
+    Not thread-safe on its own; MetricsCollector guards it with its lock.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        # One extra bucket for samples above the last bound
+        self.buckets = [0] * (len(_LATENCY_BOUNDS_MS) + 1)
+
+    def record(self, latency_ms: float):
+        """
+        Add one latency sample.
+
+        :param latency_ms: Latency in milliseconds
+        """
+        self.count += 1
+        self.total += latency_ms
+        if latency_ms < self.min:
+            self.min = latency_ms
+        if latency_ms > self.max:
+            self.max = latency_ms
+        self.buckets[bisect_left(_LATENCY_BOUNDS_MS, latency_ms)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimate a percentile from the bucket counts, interpolating linearly
+        inside the bucket it falls in (like Prometheus' histogram_quantile).
+
+        :param fraction: Percentile as a fraction, e.g. 0.95
+        :return: Latency in milliseconds (0 if nothing was recorded)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = fraction * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = _LATENCY_BOUNDS_MS[index - 1] if index else 0.0
+                upper = (
+                    _LATENCY_BOUNDS_MS[index]
+                    if index < len(_LATENCY_BOUNDS_MS)
+                    else self.max
+                )
+                estimate = lower + (upper - lower) * (
+                    (rank - cumulative) / bucket_count
+                )
+                # Never report outside the observed range
+                return min(max(estimate, self.min), self.max)
+            cumulative += bucket_count
+
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """Average latency in milliseconds (0 if nothing was recorded)."""
+        return self.total / self.count if self.count else 0.0
+
+
+class BulkHistogram:
+    """
+    Prometheus histogram filled in bulk from already-batched samples.
+    prometheus_client's Histogram scans its buckets and takes a lock for every
+    observe(); here each sample is one bisect into plain int counts, and the
+    cumulative bucket series are only built when Prometheus scrapes.
+    Registers itself with registry, like the built-in metrics.
+    """
+
+    def __init__(self, name, documentation, labelnames, buckets, registry=REGISTRY):
+        self._name = name
+        self._documentation = documentation
+        self._labelnames = tuple(labelnames)
+        self._bounds = tuple(buckets)
+        self._lock = threading.Lock()
+        # label values -> [bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        registry.register(self)
+
+    def observe_many(self, labelvalues: Tuple[str, ...], samples, scale=1.0):
+        """
+        Add samples to the series for labelvalues.
+
+        :param labelvalues: Label values, in labelnames order
+        :param samples: Iterable of observed values
+        :param scale: Factor applied to each sample (e.g. 0.001 for ms -> s)
+        """
+        bounds = self._bounds
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(bounds) + 1), 0.0]
+            counts = series[0]
+            total = 0.0
+            for value in samples:
+                value *= scale
+                counts[bisect_left(bounds, value)] += 1
+                total += value
+            series[1] += total
+
+    def describe(self):
+        """Metric metadata, so registering doesn't call collect()."""
+        return [
+            HistogramMetricFamily(
+                self._name, self._documentation, labels=self._labelnames
+            )
+        ]
+
+    def collect(self):
+        """Build the cumulative bucket series for a scrape."""
+        family = HistogramMetricFamily(
+            self._name, self._documentation, labels=self._labelnames
+        )
+        with self._lock:
+            series = [
+                (labelvalues, list(counts), total)
+                for labelvalues, (counts, total) in self._series.items()
+            ]
+
+        for labelvalues, counts, total in series:
+            cumulative = 0
+            buckets = []
+            for bound, count in zip(self._bounds, counts):
+                cumulative += count
+                buckets.append((floatToGoString(bound), cumulative))
+            buckets.append(("+Inf", cumulative + counts[-1]))
+            family.add_metric(labelvalues, buckets, total)
+        yield family
+
+
+def _cache_key(cache_name: str) -> str:
+    """JSON key of a cache's stats: "cache" for the CRUD cache, else <name>_cache."""
+    return "cache" if cache_name == "crud" else f"{cache_name}_cache"
 
 
 class MetricsCollector:
@@ -24,7 +174,9 @@ class MetricsCollector:
     def __init__(self, service_name="unknown"):
         self._lock = threading.Lock()
         self._operation_counts: Dict[str, int] = defaultdict(int)
-        self._operation_latencies: Dict[str, List[float]] = defaultdict(list)
+        self._operation_latencies: Dict[str, LatencyHistogram] = defaultdict(
+            LatencyHistogram
+        )
         self._start_time = time.time()
         self.service_name = service_name
 
@@ -35,7 +187,7 @@ class MetricsCollector:
             ["service", "operation"],
         )
 
-        self.prom_request_latency = Histogram(
+        self.prom_request_latency = BulkHistogram(
             "soap_request_duration_seconds",
             "SOAP request latency in seconds",
             ["service", "operation"],
@@ -45,28 +197,45 @@ class MetricsCollector:
         self.prom_uptime = Gauge(
             "soap_service_uptime_seconds", "Service uptime in seconds", ["service"]
         )
+        self._uptime_gauge = self.prom_uptime.labels(service=service_name)
 
-        # Cache metrics
+        # Cache metrics, labelled with the cache name (e.g. crud, report)
         self.prom_cache_hits = Counter(
-            "soap_cache_hits_total", "Total number of cache hits", ["service"]
+            "soap_cache_hits_total", "Total number of cache hits", ["service", "cache"]
         )
 
         self.prom_cache_misses = Counter(
-            "soap_cache_misses_total", "Total number of cache misses", ["service"]
+            "soap_cache_misses_total",
+            "Total number of cache misses",
+            ["service", "cache"],
         )
 
         self.prom_cache_size = Gauge(
-            "soap_cache_size", "Current number of entries in cache", ["service"]
+            "soap_cache_size",
+            "Current number of entries in cache",
+            ["service", "cache"],
         )
 
         self.prom_cache_evictions = Counter(
-            "soap_cache_evictions_total", "Total number of cache evictions", ["service"]
+            "soap_cache_evictions_total",
+            "Total number of cache evictions",
+            ["service", "cache"],
         )
 
+        # Last JSON stats per operation with the call count they were built at;
+        # reused by get_metrics while the operation sees no new calls
+        self._operation_snapshots: Dict[str, Tuple[int, dict]] = {}
+
+        # Prometheus updates buffered by record_call/record_cache_hit and
+        # applied in bulk by flush_prometheus, off the request path
+        self._pending_counts: Dict[str, int] = defaultdict(int)
+        self._pending_latencies: Dict[str, list] = defaultdict(list)
+        self._counter_by_op = {}
+        self._cache_children = {}
+
         # **NEW: Track last values for delta calculation**
-        self._last_cache_hits = 0
-        self._last_cache_misses = 0
-        self._last_cache_evictions = 0
+        # Per cache name: (hits, misses, evictions) at the last update
+        self._last_cache_counts: Dict[str, Tuple[int, int, int]] = {}
 
     def record_call(self, operation_name: str, latency_ms: float):
         """
@@ -77,116 +246,182 @@ class MetricsCollector:
         """
         with self._lock:
             self._operation_counts[operation_name] += 1
-            self._operation_latencies[operation_name].append(latency_ms)
+            self._operation_latencies[operation_name].record(latency_ms)
 
-        # Update Prometheus metrics
-        self.prom_request_counter.labels(
-            service=self.service_name, operation=operation_name
-        ).inc()
+            # Queued for Prometheus, see flush_prometheus
+            self._pending_counts[operation_name] += 1
+            self._pending_latencies[operation_name].append(latency_ms)
 
-        self.prom_request_latency.labels(
-            service=self.service_name, operation=operation_name
-        ).observe(
-            latency_ms / 1000.0
-        )  # Convert ms to seconds
+    def record_cache_hit(self, operation_name: str):
+        """
+        Record a call served from cache.
+        It is counted, but kept out of the latency histogram so that
+        zero-latency hits don't skew the percentiles.
 
-    def update_cache_metrics(self, cache_stats: Dict):
+        :param operation_name: Name of the operation (e.g. GetClientIdentity_cached)
+        """
+        with self._lock:
+            self._operation_counts[operation_name] += 1
+            self._pending_counts[operation_name] += 1
+
+    def flush_prometheus(self):
+        """
+        Apply the request counts and latencies queued since the last flush to
+        the Prometheus metrics. Called periodically by the server and before
+        each Prometheus export.
+        """
+        with self._lock:
+            if not self._pending_counts:
+                return
+            counts, self._pending_counts = self._pending_counts, defaultdict(int)
+            latencies, self._pending_latencies = (
+                self._pending_latencies,
+                defaultdict(list),
+            )
+
+        for operation_name, count in counts.items():
+            counter = self._counter_by_op.get(operation_name)
+            if counter is None:
+                counter = self._counter_by_op[operation_name] = (
+                    self.prom_request_counter.labels(
+                        service=self.service_name, operation=operation_name
+                    )
+                )
+            counter.inc(count)
+
+        for operation_name, samples in latencies.items():
+            self.prom_request_latency.observe_many(
+                (self.service_name, operation_name),
+                samples,
+                scale=0.001,  # Convert ms to seconds
+            )
+
+    def _update_cache_metrics(self, cache_stats: Dict[str, Dict]):
         """
         Update cache-related metrics.
 
-        :param cache_stats: Dictionary from TTLCache.get_stats()
+        :param cache_stats: TTLCache.get_stats() dictionaries by cache name
         """
+        for cache_name, stats in cache_stats.items():
+            self._update_one_cache(cache_name, stats)
+
+    def _update_one_cache(self, cache_name: str, stats: Dict):
+        """Update the metrics labelled with cache_name from its stats."""
+        children = self._cache_children.get(cache_name)
+        if children is None:
+            # Bound on first use, so only services with a cache export these
+            children = self._cache_children[cache_name] = tuple(
+                metric.labels(service=self.service_name, cache=cache_name)
+                for metric in (
+                    self.prom_cache_size,
+                    self.prom_cache_hits,
+                    self.prom_cache_misses,
+                    self.prom_cache_evictions,
+                )
+            )
+        size_gauge, hits_counter, misses_counter, evictions_counter = children
+
         # Update cache size gauge (Gauge uses .set())
-        self.prom_cache_size.labels(service=self.service_name).set(cache_stats["size"])
+        size_gauge.set(stats["size"])
 
         # **FIXED: Counters must be incremented, not set**
         # Calculate deltas since last update
-        hits_delta = cache_stats["hits"] - self._last_cache_hits
-        misses_delta = cache_stats["misses"] - self._last_cache_misses
-        evictions_delta = cache_stats["evictions"] - self._last_cache_evictions
+        last_hits, last_misses, last_evictions = self._last_cache_counts.get(
+            cache_name, (0, 0, 0)
+        )
+        hits_delta = stats["hits"] - last_hits
+        misses_delta = stats["misses"] - last_misses
+        evictions_delta = stats["evictions"] - last_evictions
 
         # Increment counters by delta (Counter uses .inc())
         if hits_delta > 0:
-            self.prom_cache_hits.labels(service=self.service_name).inc(hits_delta)
+            hits_counter.inc(hits_delta)
         if misses_delta > 0:
-            self.prom_cache_misses.labels(service=self.service_name).inc(misses_delta)
+            misses_counter.inc(misses_delta)
         if evictions_delta > 0:
-            self.prom_cache_evictions.labels(service=self.service_name).inc(
-                evictions_delta
-            )
+            evictions_counter.inc(evictions_delta)
 
         # Update last known values
-        self._last_cache_hits = cache_stats["hits"]
-        self._last_cache_misses = cache_stats["misses"]
-        self._last_cache_evictions = cache_stats["evictions"]
+        self._last_cache_counts[cache_name] = (
+            stats["hits"],
+            stats["misses"],
+            stats["evictions"],
+        )
 
-    def get_metrics(self, cache_stats: Optional[Dict] = None) -> dict:
+    def get_metrics(self, cache_stats: Optional[Dict[str, Dict]] = None) -> dict:
         """
         Get current metrics snapshot in JSON format.
 
-        :param cache_stats: Optional cache statistics to include
+        :param cache_stats: Optional cache statistics by cache name; the CRUD
+            cache is reported under "cache", any other one under "<name>_cache"
         :return: Dictionary with metrics
         """
         with self._lock:
             uptime = time.time() - self._start_time
 
             # Update uptime gauge
-            self.prom_uptime.labels(service=self.service_name).set(uptime)
+            self._uptime_gauge.set(uptime)
 
             metrics = {"uptime_seconds": uptime, "operations": {}}
 
             # Include cache stats if provided
             if cache_stats:
-                metrics["cache"] = cache_stats
-                self.update_cache_metrics(cache_stats)
-
-            for operation_name in self._operation_counts:
-                latencies = self._operation_latencies[operation_name]
-                count = self._operation_counts[operation_name]
-
-                if latencies:
-                    avg_latency = sum(latencies) / len(latencies)
-                    min_latency = min(latencies)
-                    max_latency = max(latencies)
-
-                    # Calculate p95 (95th percentile)
-                    sorted_latencies = sorted(latencies)
-                    p95_index = int(len(sorted_latencies) * 0.95)
-                    p95_latency = (
-                        sorted_latencies[p95_index]
-                        if p95_index < len(sorted_latencies)
-                        else max_latency
-                    )
+                for cache_name, stats in cache_stats.items():
+                    metrics[_cache_key(cache_name)] = stats
+                self._update_cache_metrics(cache_stats)
+
+            for operation_name, count in self._operation_counts.items():
+                snapshot = self._operation_snapshots.get(operation_name)
+                if snapshot is not None and snapshot[0] == count:
+                    metrics["operations"][operation_name] = snapshot[1]
+                    continue
+
+                latencies = self._operation_latencies.get(operation_name)
+
+                if latencies is not None:
+                    avg_latency = latencies.mean
+                    min_latency = latencies.min
+                    max_latency = latencies.max
+                    # p95 (95th percentile) estimated from the histogram
+                    p95_latency = latencies.percentile(0.95)
                 else:
                     avg_latency = min_latency = max_latency = p95_latency = 0
 
-                metrics["operations"][operation_name] = {
+                operation_metrics = {
                     "call_count": count,
                     "avg_latency_ms": round(avg_latency, 2),
                     "min_latency_ms": round(min_latency, 2),
                     "max_latency_ms": round(max_latency, 2),
                     "p95_latency_ms": round(p95_latency, 2),
                 }
+                self._operation_snapshots[operation_name] = (count, operation_metrics)
+                metrics["operations"][operation_name] = operation_metrics
 
             return metrics
 
-    def get_prometheus_metrics(self) -> bytes:
+    def scrape_prometheus(self, cache_stats: Optional[Dict[str, Dict]] = None) -> bytes:
         """
-        Get metrics in Prometheus format.
+        Get metrics in Prometheus format, in one pass: flush the buffered
+        request metrics, update uptime and cache metrics, then export.
 
+        :param cache_stats: Optional cache statistics by cache name to export
         :return: Prometheus metrics as bytes
         """
+        self.flush_prometheus()
+
         # Update uptime before export
-        uptime = time.time() - self._start_time
-        self.prom_uptime.labels(service=self.service_name).set(uptime)
+        self._uptime_gauge.set(time.time() - self._start_time)
+
+        if cache_stats:
+            self._update_cache_metrics(cache_stats)
 
         return generate_latest()
 
-    def get_summary(self, cache_stats: Optional[Dict] = None) -> str:
+    def get_summary(self, cache_stats: Optional[Dict[str, Dict]] = None) -> str:
         """
         Get human-readable metrics summary.
 
-        :param cache_stats: Optional cache statistics to include
+        :param cache_stats: Optional cache statistics by cache name to include
         :return: Formatted string with metrics
         """
         metrics = self.get_metrics(cache_stats)
@@ -199,9 +434,9 @@ class MetricsCollector:
         ]
 
         # Add cache summary
-        if "cache" in metrics:
-            cache = metrics["cache"]
-            lines.append("Cache Statistics:")
+        for cache_name in cache_stats or ():
+            cache = metrics[_cache_key(cache_name)]
+            lines.append(f"Cache Statistics ({cache_name}):")
             lines.append(f"  Size: {cache['size']}/{cache['max_size']}")
             lines.append(f"  Hit Rate: {cache['hit_rate_percent']}%")
             lines.append(f"  Hits: {cache['hits']}, Misses: {cache['misses']}")
@@ -223,13 +458,20 @@ class MetricsCollector:
 
 # Global metrics collector instance per service
 _metrics_collector = None
+_collector_lock = threading.Lock()
 
 
 def get_metrics_collector(service_name="unknown") -> MetricsCollector:
-    """Get or create the global metrics collector instance."""
+    """
+    Get or create the global metrics collector instance.
+    Creation is locked: a second collector would register duplicate
+    Prometheus metrics and raise.
+    """
     global _metrics_collector
     if _metrics_collector is None:
-        _metrics_collector = MetricsCollector(service_name)
+        with _collector_lock:
+            if _metrics_collector is None:
+                _metrics_collector = MetricsCollector(service_name)
     return _metrics_collector
 
 
@@ -1,4 +1,7 @@
+import functools
 import logging
+import os
+import socket
 from twisted.web.server import Site
 from twisted.web.resource import Resource
 from twisted.internet import reactor
@@ -16,24 +19,62 @@ class HealthResource(Resource):
 
     def __init__(self, service_name):
         self.service_name = service_name
+        # The response never changes, so it is encoded once
+        self._body = f"{service_name} is running and healthy.".encode("utf-8")
+        self._content_type = [b"text/plain"]
 
     def render_GET(self, request):
         # A simple response indicating the service is alive
-        request.setHeader(b"Content-Type", b"text/plain")
-        return f"{self.service_name} is running and healthy.".encode("utf-8")
+        request.responseHeaders.setRawHeaders(b"Content-Type", self._content_type)
+        return self._body
 
 
-def start_server(service_name, port=8000):
-    """Starts a minimal Twisted HTTP server for a given service."""
+def listen_tcp(port, factory, interface="", reuse_port=None):
+    """
+    Listen on a TCP port like reactor.listenTCP, with TCP_NODELAY set so
+    small responses aren't delayed by Nagle's algorithm (Linux copies it to
+    accepted connections).
+
+    :param reuse_port: Set SO_REUSEPORT so several processes can accept on
+        the same port (default: TCP_REUSEPORT=1 in the environment). Off by
+        default, since it also lets a second server silently share the port.
+    """
+    if reuse_port is None:
+        reuse_port = os.getenv("TCP_REUSEPORT", "0") == "1"
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port and hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.bind((interface, port))
+        sock.listen(50)
+        sock.setblocking(False)
+        # The reactor takes a duplicate of the descriptor
+        return reactor.adoptStreamPort(sock.fileno(), socket.AF_INET, factory)
+    finally:
+        sock.close()
+
 
+@functools.lru_cache(maxsize=None)
+def _root(service_name):
+    """Resource tree for a service, built once and reused by later starts."""
     root = Resource()
     root.putChild(b"health", HealthResource(service_name))
+    return root
+
+
+def start_server(service_name, port=8000):
+    """Starts a minimal Twisted HTTP server for a given service."""
+
+    root = _root(service_name)
 
     # Use the logger instead of print
     logger.info(f"[{service_name}] Starting server on port {port}...")
 
     factory = Site(root)
-    reactor.listenTCP(port, factory)
+    listen_tcp(port, factory)
 
     reactor.run()
     # Use the logger instead of print
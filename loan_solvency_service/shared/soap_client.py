@@ -1,17 +1,71 @@
 import logging
+import os
+import random
+import requests
+from requests.adapters import HTTPAdapter
 from zeep import Client
+from zeep.cache import InMemoryCache, SqliteCache
 from zeep.exceptions import Fault
+from zeep.transports import Transport
 import time
 
 logger = logging.getLogger(__name__)
 
 
+def _build_session():
+    """
+    Build the HTTP session shared by every InternalSoapClient.
+    Connections are pooled per host (pool_maxsize is the most kept open to
+    one service, like http.maxConnections) and kept alive across calls.
+    The adapter does not retry: connection retries belong to
+    InternalSoapClient._initialize_client, so their number and backoff
+    stay bounded in one place.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# One connection pool for all internal services, instead of one per client
+_shared_session = _build_session()
+
+# Fetched WSDL/XSD documents are cached in memory for the process lifetime.
+# Setting WSDL_CACHE_PATH keeps them on disk across restarts instead; use a
+# path per deployment, or a redeployed service's new WSDL is ignored until
+# the cached copy expires
+WSDL_CACHE_PATH = os.getenv("WSDL_CACHE_PATH", "")
+WSDL_CACHE_TTL_SECONDS = int(os.getenv("WSDL_CACHE_TTL_SECONDS", "3600"))
+
+
+def _build_wsdl_cache():
+    """Build the document cache shared by every InternalSoapClient."""
+    if WSDL_CACHE_PATH:
+        try:
+            return SqliteCache(path=WSDL_CACHE_PATH, timeout=WSDL_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning("WSDL disk cache unavailable (%s), using memory", e)
+    return InMemoryCache(timeout=WSDL_CACHE_TTL_SECONDS)
+
+
+_wsdl_cache = _build_wsdl_cache()
+
+
 class InternalSoapClient:
     """
     Wrapper for making SOAP calls to internal services with retry logic and metrics.
     """
 
-    def __init__(self, wsdl_url, service_name, max_retries=3, timeout=5):
+    def __init__(
+        self,
+        wsdl_url,
+        service_name,
+        max_retries=3,
+        timeout=5,
+        base_backoff=0.1,
+        max_backoff=5.0,
+    ):
         """
         Initialize SOAP client for internal service communication.
 
@@ -19,75 +73,141 @@ class InternalSoapClient:
         :param service_name: Name for logging purposes
         :param max_retries: Number of retry attempts
         :param timeout: Timeout in seconds
+        :param base_backoff: Shortest wait between connection attempts, in seconds
+        :param max_backoff: Longest wait between connection attempts, in seconds
         """
         self.wsdl_url = wsdl_url
         self.service_name = service_name
         self.max_retries = max_retries
         self.timeout = timeout
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
         self.client = None
+        # Bound zeep operations by name, resolved once per client
+        self._operations = {}
+        self.transport = self._build_transport()
 
         self._initialize_client()
 
+    def _build_transport(self):
+        """
+        Build a zeep transport on the shared keep-alive session and the
+        shared WSDL/XSD document cache.
+        """
+        return Transport(
+            session=_shared_session,
+            cache=_wsdl_cache,
+            timeout=self.timeout,
+            operation_timeout=self.timeout,
+        )
+
     def _initialize_client(self):
         """Initialize the zeep client with retry logic."""
         for attempt in range(self.max_retries):
             try:
                 logger.info(
-                    f"Connecting to {self.service_name} at {self.wsdl_url} (attempt {attempt + 1}/{self.max_retries})"
+                    "Connecting to %s at %s (attempt %d/%d)",
+                    self.service_name,
+                    self.wsdl_url,
+                    attempt + 1,
+                    self.max_retries,
                 )
-                self.client = Client(self.wsdl_url)
-                logger.info(f"Successfully connected to {self.service_name}")
+                self.client = Client(self.wsdl_url, transport=self.transport)
+                logger.info("Successfully connected to %s", self.service_name)
                 return
             except Exception as e:
-                logger.warning(f"Failed to connect to {self.service_name}: {e}")
+                logger.warning("Failed to connect to %s: %s", self.service_name, e)
                 if attempt < self.max_retries - 1:
-                    time.sleep(2**attempt)  # Exponential backoff
+                    time.sleep(self._backoff(attempt))
                 else:
                     logger.error(
-                        f"Could not connect to {self.service_name} after {self.max_retries} attempts"
+                        "Could not connect to %s after %d attempts",
+                        self.service_name,
+                        self.max_retries,
                     )
                     raise
 
-    def call_operation(self, operation_name, correlation_id=None, **kwargs):
+    def _backoff(self, attempt):
+        """
+        Seconds to wait before retrying after a failed attempt: exponential,
+        randomly jittered so restarting replicas don't retry in lockstep, and
+        capped at max_backoff.
+        """
+        ceiling = self.base_backoff * 3 * 2**attempt
+        return min(self.max_backoff, random.uniform(self.base_backoff, ceiling))
+
+    def call_operation(
+        self, operation_name, correlation_id=None, correlation_header=None, **kwargs
+    ):
         """
         Call a SOAP operation with latency tracking.
 
         :param operation_name: Name of the operation to call
         :param correlation_id: Correlation ID for tracing
+        :param correlation_header: Pre-built correlation ID SOAP header element
+            (see build_correlation_header), sent along with the request
         :param kwargs: Operation parameters
         :return: Operation result
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
-            logger.info(
-                f"[{correlation_id}] Calling {self.service_name}.{operation_name} with params: {kwargs}"
-            )
+            # Skip even the call when INFO is off: kwargs may be large
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "[%s] Calling %s.%s with params: %r",
+                    correlation_id,
+                    self.service_name,
+                    operation_name,
+                    kwargs,
+                )
 
-            # Get the operation from the service
-            operation = getattr(self.client.service, operation_name)
+            # Bound operation, resolved once per client and reused
+            operation = self._operations.get(operation_name)
+            if operation is None:
+                operation = self._operations[operation_name] = getattr(
+                    self.client.service, operation_name
+                )
 
             # Make the call
-            result = operation(**kwargs)
+            if correlation_header is not None:
+                result = operation(**kwargs, _soapheaders=[correlation_header])
+            else:
+                result = operation(**kwargs)
 
             # Calculate latency
-            latency = (time.time() - start_time) * 1000  # Convert to milliseconds
+            # Nanoseconds to milliseconds
+            latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
             logger.info(
-                f"[{correlation_id}] {self.service_name}.{operation_name} completed in {latency:.2f}ms"
+                "[%s] %s.%s completed in %.2fms",
+                correlation_id,
+                self.service_name,
+                operation_name,
+                latency_ms,
             )
 
-            return result, latency
+            return result, latency_ms
 
         except Fault as e:
-            latency = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
             logger.error(
-                f"[{correlation_id}] {self.service_name}.{operation_name} failed with SOAP Fault: {e}"
+                "[%s] %s.%s failed with SOAP Fault after %.2fms: %s",
+                correlation_id,
+                self.service_name,
+                operation_name,
+                latency_ms,
+                e,
             )
             raise
         except Exception as e:
-            latency = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
             logger.error(
-                f"[{correlation_id}] {self.service_name}.{operation_name} failed: {e}"
+                "[%s] %s.%s failed after %.2fms: %s",
+                correlation_id,
+                self.service_name,
+                operation_name,
+                latency_ms,
+                e,
             )
             raise
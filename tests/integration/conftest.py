@@ -0,0 +1,23 @@
+import pytest
+
+# Every field a SolvencyReport must carry, as attribute paths
+REQUIRED_REPORT_FIELDS = (
+    "client_identity.name",
+    "client_identity.address",
+    "financials.monthly_income",
+    "financials.monthly_expenses",
+    "credit_history.debt",
+    "credit_history.late_payments",
+    "credit_history.has_bankruptcy",
+    "credit_score",
+    "solvency_status.status",
+    "explanations.credit_score_explanation",
+    "explanations.income_vs_expenses_explanation",
+    "explanations.credit_history_explanation",
+)
+
+
+@pytest.fixture(scope="session")
+def required_report_fields():
+    """Attribute paths of the fields every SolvencyReport must carry."""
+    return REQUIRED_REPORT_FIELDS
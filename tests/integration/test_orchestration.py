@@ -1,13 +1,20 @@
+import os
 import pytest
+from operator import attrgetter
 from decimal import Decimal
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 from loan_solvency_service.shared.db_setup import Base, Client
+from loan_solvency_service.services.orchestration import (
+    SolvencyVerificationService as svc,
+)
 from loan_solvency_service.services.orchestration.SolvencyVerificationService import (
     SolvencyVerificationService,
 )
 from loan_solvency_service.shared.base_service import ClientNotFoundFault
 from loan_solvency_service.shared import db_setup
+from loan_solvency_service.shared.metrics import get_metrics_collector
 
 # Test data matching project requirements
 TEST_CLIENTS = [
@@ -44,148 +51,145 @@ TEST_CLIENTS = [
 ]
 
 
-@pytest.fixture(scope="function")
-def test_db():
+@pytest.fixture(scope="session")
+def test_engine():
     """
-    Creates an in-memory SQLite database for isolated testing.
-    Each test gets a fresh database.
+    Creates an in-memory SQLite database once for the whole test run.
+    StaticPool keeps its single connection (and so the data) alive.
     """
-    # Create in-memory SQLite engine
-    engine = create_engine("sqlite:///:memory:")
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # Throwaway database: skip journaling, fsyncs and on-disk temp files
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 
     # Create all tables
     Base.metadata.create_all(engine)
 
-    # Create session factory
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Insert test data (one executemany, no ORM objects)
+    with Session(engine) as session:
+        session.execute(insert(Client), TEST_CLIENTS)
+        session.commit()
 
-    # Override the global SessionLocal used by services
-    original_session = db_setup.SessionLocal
-    db_setup.SessionLocal = TestSessionLocal
+    yield engine
 
-    # Insert test data
-    session = TestSessionLocal()
-    for client_data in TEST_CLIENTS:
-        client = Client(**client_data)
-        session.add(client)
-    session.commit()
-    session.close()
-
-    yield TestSessionLocal
-
-    # Cleanup: restore original session and close engine
-    db_setup.SessionLocal = original_session
     engine.dispose()
 
 
-# ============================================
-# Integration Tests for Full Orchestration
-# ============================================
-
-
-def test_verify_solvency_client_001_not_solvent(test_db):
+@pytest.fixture(scope="function")
+def test_db(test_engine, monkeypatch):
     """
-    Test client-001: John Doe
-    Expected: score 400 -> not_solvent
-    Formula: 1000 - 0.1*5000 - 50*2 - 0 = 400
-    Decision: 400 < 700 -> not_solvent (even though income > expenses)
+    Runs each test inside a transaction that is rolled back afterwards,
+    so every test sees the same seeded database.
     """
-    report = SolvencyVerificationService.VerifySolvency("client-001")
-
-    # Verify identity
-    assert report.client_identity.name == "John Doe"
-    assert report.client_identity.address == "123 Main St"
+    connection = test_engine.connect()
+    transaction = connection.begin()
+
+    # Sessions join the test transaction; their commits become savepoints.
+    # Scoped like the real SessionLocal, so every VerifySolvency call in a
+    # test reuses the same Session object
+    TestSessionLocal = scoped_session(
+        sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+        )
+    )
 
-    # Verify financials
-    assert report.financials.monthly_income == Decimal("4000.00")
-    assert report.financials.monthly_expenses == Decimal("3000.00")
+    # Override the global SessionLocal used by services (undone by monkeypatch)
+    monkeypatch.setattr(db_setup, "SessionLocal", TestSessionLocal)
+    # Serve CRUD lookups from the test database instead of the CRUD service
+    monkeypatch.setattr(svc, "CRUD_IN_PROCESS", True)
 
-    # Verify credit history
-    assert report.credit_history.debt == Decimal("5000.00")
-    assert report.credit_history.late_payments == 2
-    assert report.credit_history.has_bankruptcy is False
+    yield TestSessionLocal
 
-    # Verify credit score
-    assert report.credit_score == 400
+    # Cleanup: undo the test's changes
+    TestSessionLocal.remove()
+    transaction.rollback()
+    connection.close()
 
-    # Verify solvency status
-    assert report.solvency_status.status == "not_solvent"
 
-    # Verify explanations exist and are non-empty
-    assert len(report.explanations.credit_score_explanation) > 0
-    assert len(report.explanations.income_vs_expenses_explanation) > 0
-    assert len(report.explanations.credit_history_explanation) > 0
+# ============================================
+# Integration Tests for Full Orchestration
+# ============================================
 
 
-def test_verify_solvency_client_002_solvent(test_db):
+@pytest.mark.parametrize(
+    "client, expected_score, expected_status",
+    [
+        # 1000 - 0.1*5000 - 50*2 - 0 = 400 < 700 (even though income > expenses)
+        pytest.param(TEST_CLIENTS[0], 400, "not_solvent", id="client-001"),
+        # 1000 - 0.1*2000 - 0 - 0 = 800 >= 700 AND 3000 > 2500
+        pytest.param(TEST_CLIENTS[1], 800, "solvent", id="client-002"),
+        # 1000 - 0.1*10000 - 50*5 - 200 = -450, clamped to 0 < 700
+        pytest.param(TEST_CLIENTS[2], 0, "not_solvent", id="client-003"),
+    ],
+)
+def test_verify_solvency_test_clients(test_db, client, expected_score, expected_status):
     """
-    Test client-002: Alice Smith
-    Expected: score 800 -> solvent
-    Formula: 1000 - 0.1*2000 - 0 - 0 = 800
-    Decision: 800 >= 700 AND 3000 > 2500 -> solvent
+    Test the three required clients end to end:
+    client-001 (John Doe) -> 400 not_solvent, client-002 (Alice Smith) ->
+    800 solvent, client-003 (Bob Johnson) -> 0 not_solvent
     """
-    report = SolvencyVerificationService.VerifySolvency("client-002")
+    report = SolvencyVerificationService.VerifySolvency(client["client_id"])
 
     # Verify identity
-    assert report.client_identity.name == "Alice Smith"
-    assert report.client_identity.address == "456 Elm St"
+    assert report.client_identity.name == client["name"]
+    assert report.client_identity.address == client["address"]
 
     # Verify financials
-    assert report.financials.monthly_income == Decimal("3000.00")
-    assert report.financials.monthly_expenses == Decimal("2500.00")
+    assert report.financials.monthly_income == client["monthly_income"]
+    assert report.financials.monthly_expenses == client["monthly_expenses"]
 
     # Verify credit history
-    assert report.credit_history.debt == Decimal("2000.00")
-    assert report.credit_history.late_payments == 0
-    assert report.credit_history.has_bankruptcy is False
+    assert report.credit_history.debt == client["debt"]
+    assert report.credit_history.late_payments == client["late_payments"]
+    assert report.credit_history.has_bankruptcy is client["has_bankruptcy"]
 
     # Verify credit score
-    assert report.credit_score == 800
+    assert report.credit_score == expected_score
 
     # Verify solvency status
-    assert report.solvency_status.status == "solvent"
+    assert report.solvency_status.status == expected_status
 
-    # Verify explanations exist
+    # Verify explanations exist and are non-empty
     assert len(report.explanations.credit_score_explanation) > 0
     assert len(report.explanations.income_vs_expenses_explanation) > 0
     assert len(report.explanations.credit_history_explanation) > 0
 
+    # Verify bankruptcy is mentioned
+    if client["has_bankruptcy"]:
+        assert "bankruptcy" in report.explanations.credit_history_explanation.lower()
 
-def test_verify_solvency_client_003_not_solvent(test_db):
-    """
-    Test client-003: Bob Johnson
-    Expected: score -450 clamped to 0 -> not_solvent
-    Formula: 1000 - 0.1*10000 - 50*5 - 200 = -450 -> 0
-    Decision: 0 < 700 -> not_solvent
-    """
-    report = SolvencyVerificationService.VerifySolvency("client-003")
-
-    # Verify identity
-    assert report.client_identity.name == "Bob Johnson"
-    assert report.client_identity.address == "789 Oak St"
-
-    # Verify financials
-    assert report.financials.monthly_income == Decimal("6000.00")
-    assert report.financials.monthly_expenses == Decimal("5500.00")
 
-    # Verify credit history
-    assert report.credit_history.debt == Decimal("10000.00")
-    assert report.credit_history.late_payments == 5
-    assert report.credit_history.has_bankruptcy is True
+def test_crud_calls_go_over_soap_by_default(monkeypatch):
+    """Without CRUD_IN_PROCESS, CRUD lookups call the CRUD service"""
+    calls = []
 
-    # Verify credit score (should be clamped to 0)
-    assert report.credit_score == 0
+    class FakeCrudClient:
+        def call_operation(self, operation_name, **kwargs):
+            calls.append((operation_name, kwargs["client_id"]))
+            return "identity", 1.0
 
-    # Verify solvency status
-    assert report.solvency_status.status == "not_solvent"
+    if "CRUD_IN_PROCESS" in os.environ:
+        pytest.skip("CRUD_IN_PROCESS is set in the environment")
+    monkeypatch.setattr(svc, "get_crud_client", FakeCrudClient)
 
-    # Verify explanations exist
-    assert len(report.explanations.credit_score_explanation) > 0
-    assert len(report.explanations.income_vs_expenses_explanation) > 0
-    assert len(report.explanations.credit_history_explanation) > 0
+    assert svc.CRUD_IN_PROCESS is False
+    result = svc.call_crud_operation("GetClientIdentity", "cid", "client-001")
 
-    # Verify bankruptcy is mentioned
-    assert "bankruptcy" in report.explanations.credit_history_explanation.lower()
+    assert result == ("identity", 1.0)
+    assert calls == [("GetClientIdentity", "client-001")]
 
 
 def test_verify_solvency_client_not_found(test_db):
@@ -196,30 +200,13 @@ def test_verify_solvency_client_not_found(test_db):
     assert "not found" in str(exc_info.value).lower()
 
 
-def test_verify_solvency_report_structure(test_db):
+def test_verify_solvency_report_structure(test_db, required_report_fields):
     """Test that the returned report has all required fields"""
     report = SolvencyVerificationService.VerifySolvency("client-002")
 
-    # Verify all top-level fields exist
-    assert hasattr(report, "client_identity")
-    assert hasattr(report, "financials")
-    assert hasattr(report, "credit_history")
-    assert hasattr(report, "credit_score")
-    assert hasattr(report, "solvency_status")
-    assert hasattr(report, "explanations")
-
-    # Verify nested structures
-    assert hasattr(report.client_identity, "name")
-    assert hasattr(report.client_identity, "address")
-    assert hasattr(report.financials, "monthly_income")
-    assert hasattr(report.financials, "monthly_expenses")
-    assert hasattr(report.credit_history, "debt")
-    assert hasattr(report.credit_history, "late_payments")
-    assert hasattr(report.credit_history, "has_bankruptcy")
-    assert hasattr(report.solvency_status, "status")
-    assert hasattr(report.explanations, "credit_score_explanation")
-    assert hasattr(report.explanations, "income_vs_expenses_explanation")
-    assert hasattr(report.explanations, "credit_history_explanation")
+    # Every required field is present and set (attrgetter raises if missing)
+    for path in required_report_fields:
+        assert attrgetter(path)(report) is not None, f"{path} is not set"
 
 
 def test_verify_solvency_data_types(test_db):
@@ -289,3 +276,57 @@ def test_verify_solvency_idempotence(test_db):
     assert report1.client_identity.name == report2.client_identity.name
     assert report1.credit_score == report2.credit_score
     assert report1.solvency_status.status == report2.solvency_status.status
+
+
+def _call_count(operation_name):
+    """Calls of operation_name recorded by the metrics collector so far"""
+    operations = get_metrics_collector().get_metrics()["operations"]
+    return operations.get(operation_name, {}).get("call_count", 0)
+
+
+def test_verify_solvency_repeat_served_from_report_cache(test_db):
+    """A repeat verification returns the cached report without recomputing"""
+    report1 = SolvencyVerificationService.VerifySolvency("client-002")
+    computed = _call_count("VerifySolvency")
+    cached = _call_count("VerifySolvency_cached")
+    report2 = SolvencyVerificationService.VerifySolvency("client-002")
+
+    assert report2 is report1
+    # Hits are counted separately, with no latency sample for VerifySolvency
+    assert _call_count("VerifySolvency") == computed
+    assert _call_count("VerifySolvency_cached") == cached + 1
+
+
+def test_invalidate_client_drops_cached_report(test_db):
+    """InvalidateClient forces the next verification to be recomputed"""
+    report1 = SolvencyVerificationService.VerifySolvency("client-002")
+
+    assert SolvencyVerificationService.InvalidateClient("client-002") is True
+    assert SolvencyVerificationService.InvalidateClient("client-002") is False
+
+    report2 = SolvencyVerificationService.VerifySolvency("client-002")
+    assert report2 is not report1
+    assert report2.credit_score == report1.credit_score
+
+
+def test_verify_solvency_batch_matches_single_calls(test_db):
+    """A batch returns one report per client, in request order"""
+    client_ids = ["client-003", "client-001", "client-002"]
+
+    reports = SolvencyVerificationService.VerifySolvencyBatch(client_ids)
+
+    assert [report.client_identity.name for report in reports] == [
+        "Bob Johnson",
+        "John Doe",
+        "Alice Smith",
+    ]
+    for client_id, report in zip(client_ids, reports):
+        single = SolvencyVerificationService.VerifySolvency(client_id)
+        assert report.credit_score == single.credit_score
+        assert report.solvency_status.status == single.solvency_status.status
+
+
+def test_verify_solvency_batch_unknown_client(test_db):
+    """One unknown client fails the whole batch"""
+    with pytest.raises(ClientNotFoundFault):
+        SolvencyVerificationService.VerifySolvencyBatch(["client-001", "client-998"])
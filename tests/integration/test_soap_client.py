@@ -9,13 +9,19 @@ Run with: pytest tests/integration/test_soap_client.py -v
 """
 
 import pytest
+from operator import attrgetter
 from zeep import Client
+from zeep.cache import InMemoryCache
 from zeep.exceptions import Fault
+from zeep.transports import Transport
 from decimal import Decimal
 
 # SOAP endpoint URL
 WSDL_URL = "http://localhost:8000/SolvencyVerification?wsdl"
 
+# Fetched WSDL/XSD documents, shared by every client built in this module
+WSDL_CACHE = InMemoryCache()
+
 
 @pytest.fixture(scope="module")
 def soap_client():
@@ -24,7 +30,7 @@ def soap_client():
     Scope is module so client is reused across all tests.
     """
     try:
-        client = Client(WSDL_URL)
+        client = Client(WSDL_URL, transport=Transport(cache=WSDL_CACHE))
         return client
     except Exception as e:
         pytest.skip(
@@ -32,103 +38,109 @@ def soap_client():
         )
 
 
-# ============================================
-# Happy Path Tests - All 3 Required Clients
-# ============================================
+# The three required test clients
+TEST_CLIENT_IDS = ("client-001", "client-002", "client-003")
 
 
-def test_verify_solvency_client_001_not_solvent(soap_client):
+@pytest.fixture(scope="module")
+def responses(soap_client):
     """
-    Test client-001: John Doe
-    Expected: score 400 -> not_solvent
+    Reports for all test clients, fetched once with a single batch call
+    and shared by the tests that only inspect them.
     """
-    response = soap_client.service.VerifySolvency(client_id="client-001")
-
-    # Verify identity
-    assert response.client_identity.name == "John Doe"
-    assert response.client_identity.address == "123 Main St"
-
-    # Verify financials
-    assert float(response.financials.monthly_income) == 4000.00
-    assert float(response.financials.monthly_expenses) == 3000.00
-
-    # Verify credit history
-    assert float(response.credit_history.debt) == 5000.00
-    assert response.credit_history.late_payments == 2
-    assert response.credit_history.has_bankruptcy is False
+    reports = soap_client.service.VerifySolvencyBatch(client_ids=list(TEST_CLIENT_IDS))
+    assert len(reports) == len(TEST_CLIENT_IDS)
+    return dict(zip(TEST_CLIENT_IDS, reports))
 
-    # Verify credit score
-    assert response.credit_score == 400
-
-    # FIXED: Access status attribute directly from ComplexModel
-    assert response.solvency_status.status == "not_solvent"
 
-    # Verify explanations exist and are non-empty
-    assert len(response.explanations.credit_score_explanation) > 0
-    assert len(response.explanations.income_vs_expenses_explanation) > 0
-    assert len(response.explanations.credit_history_explanation) > 0
+# ============================================
+# Happy Path Tests - All 3 Required Clients
+# ============================================
 
 
-def test_verify_solvency_client_002_solvent(soap_client):
+@pytest.mark.parametrize(
+    "client_id, name, address, financials, credit_history, expected_score, "
+    "expected_status",
+    [
+        pytest.param(
+            "client-001",
+            "John Doe",
+            "123 Main St",
+            (4000.00, 3000.00),
+            (5000.00, 2, False),
+            400,
+            "not_solvent",
+            id="client-001",
+        ),
+        pytest.param(
+            "client-002",
+            "Alice Smith",
+            "456 Elm St",
+            (3000.00, 2500.00),
+            (2000.00, 0, False),
+            800,
+            "solvent",
+            id="client-002",
+        ),
+        # Score clamped to 0 from -450
+        pytest.param(
+            "client-003",
+            "Bob Johnson",
+            "789 Oak St",
+            (6000.00, 5500.00),
+            (10000.00, 5, True),
+            0,
+            "not_solvent",
+            id="client-003",
+        ),
+    ],
+)
+def test_verify_solvency_test_clients(
+    soap_client,
+    client_id,
+    name,
+    address,
+    financials,
+    credit_history,
+    expected_score,
+    expected_status,
+):
     """
-    Test client-002: Alice Smith
-    Expected: score 800 -> solvent
+    Test the three required clients:
+    client-001 (John Doe) -> 400 not_solvent, client-002 (Alice Smith) ->
+    800 solvent, client-003 (Bob Johnson) -> 0 not_solvent
     """
-    response = soap_client.service.VerifySolvency(client_id="client-002")
+    response = soap_client.service.VerifySolvency(client_id=client_id)
+    monthly_income, monthly_expenses = financials
+    debt, late_payments, has_bankruptcy = credit_history
 
     # Verify identity
-    assert response.client_identity.name == "Alice Smith"
-    assert response.client_identity.address == "456 Elm St"
+    assert response.client_identity.name == name
+    assert response.client_identity.address == address
 
     # Verify financials
-    assert float(response.financials.monthly_income) == 3000.00
-    assert float(response.financials.monthly_expenses) == 2500.00
+    assert float(response.financials.monthly_income) == monthly_income
+    assert float(response.financials.monthly_expenses) == monthly_expenses
 
     # Verify credit history
-    assert float(response.credit_history.debt) == 2000.00
-    assert response.credit_history.late_payments == 0
-    assert response.credit_history.has_bankruptcy is False
+    assert float(response.credit_history.debt) == debt
+    assert response.credit_history.late_payments == late_payments
+    assert response.credit_history.has_bankruptcy is has_bankruptcy
 
     # Verify credit score
-    assert response.credit_score == 800
+    assert response.credit_score == expected_score
 
     # FIXED: Access status attribute directly from ComplexModel
-    assert response.solvency_status.status == "solvent"
+    assert response.solvency_status.status == expected_status
 
-    # Verify explanations
+    # Verify explanations exist and are non-empty
     assert len(response.explanations.credit_score_explanation) > 0
     assert len(response.explanations.income_vs_expenses_explanation) > 0
     assert len(response.explanations.credit_history_explanation) > 0
 
-
-def test_verify_solvency_client_003_not_solvent(soap_client):
-    """
-    Test client-003: Bob Johnson
-    Expected: score 0 (clamped from -450) -> not_solvent
-    """
-    response = soap_client.service.VerifySolvency(client_id="client-003")
-
-    # Verify identity
-    assert response.client_identity.name == "Bob Johnson"
-    assert response.client_identity.address == "789 Oak St"
-
-    # Verify financials
-    assert float(response.financials.monthly_income) == 6000.00
-    assert float(response.financials.monthly_expenses) == 5500.00
-
-    # Verify credit history
-    assert float(response.credit_history.debt) == 10000.00
-    assert response.credit_history.late_payments == 5
-    assert response.credit_history.has_bankruptcy is True
-
-    # Verify credit score (clamped to 0)
-    assert response.credit_score == 0
-
-    # FIXED: Access status attribute directly from ComplexModel
-    assert response.solvency_status.status == "not_solvent"
-
     # Verify bankruptcy is mentioned in explanations
-    assert "bankruptcy" in response.explanations.credit_history_explanation.lower()
+    if has_bankruptcy:
+        assert "bankruptcy" in response.explanations.credit_history_explanation.lower()
 
 
 # ============================================
@@ -168,54 +180,32 @@ def test_verify_solvency_invalid_client_id_pattern(soap_client):
 # ============================================
 
 
-def test_soap_response_structure(soap_client):
+def test_soap_response_structure(soap_client, required_report_fields):
     """
     Test that SOAP response has all required fields per XSD
     """
     response = soap_client.service.VerifySolvency(client_id="client-002")
 
-    # Verify all top-level fields exist
-    assert hasattr(response, "client_identity")
-    assert hasattr(response, "financials")
-    assert hasattr(response, "credit_history")
-    assert hasattr(response, "credit_score")
-    assert hasattr(response, "solvency_status")
-    assert hasattr(response, "explanations")
-
-    # Verify nested structures
-    assert hasattr(response.client_identity, "name")
-    assert hasattr(response.client_identity, "address")
-    assert hasattr(response.financials, "monthly_income")
-    assert hasattr(response.financials, "monthly_expenses")
-    assert hasattr(response.credit_history, "debt")
-    assert hasattr(response.credit_history, "late_payments")
-    assert hasattr(response.credit_history, "has_bankruptcy")
-    assert hasattr(response.explanations, "credit_score_explanation")
-    assert hasattr(response.explanations, "income_vs_expenses_explanation")
-    assert hasattr(response.explanations, "credit_history_explanation")
-
-
-def test_soap_credit_score_range(soap_client):
+    # Every required field is present and set (attrgetter raises if missing)
+    for path in required_report_fields:
+        assert attrgetter(path)(response) is not None, f"{path} is not set"
+
+
+def test_soap_credit_score_range(responses):
     """
     Test that credit score is within valid XSD range [0, 1000]
     """
-    test_clients = ["client-001", "client-002", "client-003"]
-
-    for client_id in test_clients:
-        response = soap_client.service.VerifySolvency(client_id=client_id)
+    for client_id, response in responses.items():
         assert (
             0 <= response.credit_score <= 1000
         ), f"Score {response.credit_score} out of range for {client_id}"
 
 
-def test_soap_solvency_status_enum(soap_client):
+def test_soap_solvency_status_enum(responses):
     """
     Test that solvency status only contains valid enum values per XSD
     """
-    test_clients = ["client-001", "client-002", "client-003"]
-
-    for client_id in test_clients:
-        response = soap_client.service.VerifySolvency(client_id=client_id)
+    for client_id, response in responses.items():
         # FIXED: Access status attribute directly from ComplexModel
         assert response.solvency_status.status in [
             "solvent",
@@ -223,16 +213,15 @@ def test_soap_solvency_status_enum(soap_client):
         ], f"Invalid status for {client_id}"
 
 
-def test_soap_explanations_non_empty(soap_client):
+def test_soap_explanations_non_empty(responses):
     """
     Test that all explanation strings are non-empty per XSD minLength constraint
     """
-    response = soap_client.service.VerifySolvency(client_id="client-001")
-
-    # XSD requires minLength=1 for all explanation fields
-    assert len(response.explanations.credit_score_explanation) > 0
-    assert len(response.explanations.income_vs_expenses_explanation) > 0
-    assert len(response.explanations.credit_history_explanation) > 0
+    for response in responses.values():
+        # XSD requires minLength=1 for all explanation fields
+        assert len(response.explanations.credit_score_explanation) > 0
+        assert len(response.explanations.income_vs_expenses_explanation) > 0
+        assert len(response.explanations.credit_history_explanation) > 0
 
 
 # ============================================
@@ -3,12 +3,36 @@ from decimal import Decimal
 from loan_solvency_service.services.business_logic.CreditScoringService import (
     CreditScoringService,
 )
+from loan_solvency_service.shared.base_service import ClientValidationError
 from loan_solvency_service.services.business_logic.SolvencyDecisionService import (
     SolvencyDecisionService,
 )
 from loan_solvency_service.services.business_logic.ExplanationService import (
     ExplanationService,
 )
+from loan_solvency_service.services.business_logic.CombinedDecisionService import (
+    CombinedDecisionService,
+)
+
+# Decimal amounts shared by the tests, parsed once at import
+D_0 = Decimal("0")
+D_2000 = Decimal("2000")
+D_2500 = Decimal("2500")
+D_3000 = Decimal("3000")
+D_3500 = Decimal("3500")
+D_4000 = Decimal("4000")
+D_5000 = Decimal("5000")
+D_5500 = Decimal("5500")
+D_6000 = Decimal("6000")
+D_10000 = Decimal("10000")
+D_15000 = Decimal("15000")
+
+
+def _contains_any(text, needles):
+    """True if text contains any of the lowercase needles, ignoring case."""
+    text = text.lower()
+    return any(needle in text for needle in needles)
+
 
 # ============================================
 # Tests for CreditScoringService
@@ -18,7 +42,7 @@ from loan_solvency_service.services.business_logic.ExplanationService import (
 def test_compute_credit_score_no_issues():
     """Test score with no debt, no late payments, no bankruptcy"""
     score = CreditScoringService.ComputeCreditScore(
-        debt=Decimal("0"), late_payments=0, has_bankruptcy=False
+        debt=D_0, late_payments=0, has_bankruptcy=False
     )
     assert score == 1000
 
@@ -27,7 +51,7 @@ def test_compute_credit_score_with_debt():
     """Test score calculation with debt only"""
     # 1000 - 0.1*5000 = 500
     score = CreditScoringService.ComputeCreditScore(
-        debt=Decimal("5000"), late_payments=0, has_bankruptcy=False
+        debt=D_5000, late_payments=0, has_bankruptcy=False
     )
     assert score == 500
 
@@ -36,7 +60,7 @@ def test_compute_credit_score_with_late_payments():
     """Test score calculation with late payments only"""
     # 1000 - 50*2 = 900
     score = CreditScoringService.ComputeCreditScore(
-        debt=Decimal("0"), late_payments=2, has_bankruptcy=False
+        debt=D_0, late_payments=2, has_bankruptcy=False
     )
     assert score == 900
 
@@ -45,7 +69,7 @@ def test_compute_credit_score_with_bankruptcy():
     """Test score calculation with bankruptcy only"""
     # 1000 - 200 = 800
     score = CreditScoringService.ComputeCreditScore(
-        debt=Decimal("0"), late_payments=0, has_bankruptcy=True
+        debt=D_0, late_payments=0, has_bankruptcy=True
     )
     assert score == 800
 
@@ -55,7 +79,7 @@ def test_compute_credit_score_client_001():
     # debt=5000, late=2, bankruptcy=false
     # 1000 - 0.1*5000 - 50*2 - 0 = 1000 - 500 - 100 = 400
     score = CreditScoringService.ComputeCreditScore(
-        debt=Decimal("5000"), late_payments=2, has_bankruptcy=False
+        debt=D_5000, late_payments=2, has_bankruptcy=False
     )
     assert score == 400
 
@@ -65,7 +89,7 @@ def test_compute_credit_score_client_002():
     # debt=2000, late=0, bankruptcy=false
     # 1000 - 0.1*2000 - 0 - 0 = 1000 - 200 = 800
     score = CreditScoringService.ComputeCreditScore(
-        debt=Decimal("2000"), late_payments=0, has_bankruptcy=False
+        debt=D_2000, late_payments=0, has_bankruptcy=False
     )
     assert score == 800
 
@@ -75,101 +99,92 @@ def test_compute_credit_score_client_003():
     # debt=10000, late=5, bankruptcy=true
     # 1000 - 0.1*10000 - 50*5 - 200 = 1000 - 1000 - 250 - 200 = -450 -> clamped to 0
     score = CreditScoringService.ComputeCreditScore(
-        debt=Decimal("10000"), late_payments=5, has_bankruptcy=True
+        debt=D_10000, late_payments=5, has_bankruptcy=True
     )
     assert score == 0  # Should be clamped to minimum
 
 
-def test_compute_credit_score_clamping_upper():
-    """Test that score doesn't exceed 1000"""
-    # Even with negative debt (edge case), score should not exceed 1000
+def test_compute_credit_score_truncates_fractional_points():
+    """Test that fractional points are truncated, not rounded"""
+    # 1000 - 0.1*5005.50 = 499.45 -> 499
     score = CreditScoringService.ComputeCreditScore(
-        debt=Decimal("0"), late_payments=0, has_bankruptcy=False
+        debt=Decimal("5005.50"), late_payments=0, has_bankruptcy=False
     )
-    assert score <= 1000
+    assert score == 499
 
 
-# ============================================
-# Tests for SolvencyDecisionService
-# ============================================
-
-
-def test_decide_solvency_solvent():
-    """Test solvent case: score >= 700 and income > expenses"""
-    result = SolvencyDecisionService.DecideSolvency(
-        monthly_income=Decimal("4000"),
-        monthly_expenses=Decimal("3000"),
-        credit_score=800,
-    )
-    assert result.status == "solvent"
-
-
-def test_decide_solvency_not_solvent_low_score():
-    """Test not solvent due to low credit score"""
-    result = SolvencyDecisionService.DecideSolvency(
-        monthly_income=Decimal("5000"),
-        monthly_expenses=Decimal("3000"),
-        credit_score=650,  # Below 700
+@pytest.mark.parametrize("debt", ["0.001", "0.009", "0.0001"])
+def test_compute_credit_score_sub_cent_debt(debt):
+    """Test that any debt below one cent still lowers the score"""
+    # 1000 - 0.1*0.001 = 999.9999 -> 999
+    score = CreditScoringService.ComputeCreditScore(
+        debt=Decimal(debt), late_payments=0, has_bankruptcy=False
     )
-    assert result.status == "not_solvent"
+    assert score == 999
 
 
-def test_decide_solvency_not_solvent_expenses_exceed_income():
-    """Test not solvent due to expenses >= income"""
-    result = SolvencyDecisionService.DecideSolvency(
-        monthly_income=Decimal("3000"),
-        monthly_expenses=Decimal("3500"),
-        credit_score=800,  # Good score but expenses too high
+def test_compute_credit_score_clamping_upper():
+    """Test that score doesn't exceed 1000"""
+    # Even with negative debt (edge case), score should not exceed 1000
+    score = CreditScoringService.ComputeCreditScore(
+        debt=D_0, late_payments=0, has_bankruptcy=False
     )
-    assert result.status == "not_solvent"
+    assert score <= 1000
 
 
-def test_decide_solvency_not_solvent_break_even():
-    """Test not solvent when income equals expenses (not greater)"""
-    result = SolvencyDecisionService.DecideSolvency(
-        monthly_income=Decimal("3000"),
-        monthly_expenses=Decimal("3000"),  # Equal
-        credit_score=750,
+def test_compute_credit_score_batch_matches_single():
+    """Test that the batch operation scores each client like the single call"""
+    # client-001, client-002, client-003
+    scores = CreditScoringService.ComputeCreditScoreBatch(
+        debts=[D_5000, D_2000, D_10000],
+        late_payments=[2, 0, 5],
+        has_bankruptcies=[False, False, True],
     )
-    assert result.status == "not_solvent"
-
+    assert scores == [400, 800, 0]
 
-def test_decide_solvency_client_001():
-    """Test client-001: score 400, income > expenses -> not_solvent (low score)"""
-    result = SolvencyDecisionService.DecideSolvency(
-        monthly_income=Decimal("4000"),
-        monthly_expenses=Decimal("3000"),
-        credit_score=400,
-    )
-    assert result.status == "not_solvent"
 
+def test_compute_credit_score_batch_length_mismatch():
+    """Test that arrays of different lengths are rejected"""
+    with pytest.raises(ClientValidationError):
+        CreditScoringService.ComputeCreditScoreBatch(
+            debts=[D_5000, D_2000],
+            late_payments=[2],
+            has_bankruptcies=[False, False],
+        )
 
-def test_decide_solvency_client_002():
-    """Test client-002: score 800, income > expenses -> solvent"""
-    result = SolvencyDecisionService.DecideSolvency(
-        monthly_income=Decimal("3000"),
-        monthly_expenses=Decimal("2500"),
-        credit_score=800,
-    )
-    assert result.status == "solvent"
 
-
-def test_decide_solvency_client_003():
-    """Test client-003: score 0, income > expenses -> not_solvent (low score)"""
-    result = SolvencyDecisionService.DecideSolvency(
-        monthly_income=Decimal("6000"), monthly_expenses=Decimal("5500"), credit_score=0
-    )
-    assert result.status == "not_solvent"
+# ============================================
+# Tests for SolvencyDecisionService
+# ============================================
 
 
-def test_decide_solvency_boundary_score_700():
-    """Test boundary: score exactly 700 with income > expenses -> solvent"""
+@pytest.mark.parametrize(
+    "monthly_income, monthly_expenses, credit_score, expected",
+    [
+        # score >= 700 and income > expenses
+        pytest.param(D_4000, D_3000, 800, "solvent", id="solvent"),
+        pytest.param(D_5000, D_3000, 650, "not_solvent", id="low_score"),
+        # Good score but expenses too high
+        pytest.param(D_3000, D_3500, 800, "not_solvent", id="expenses_exceed_income"),
+        # Income must be greater than expenses, not equal
+        pytest.param(D_3000, D_3000, 750, "not_solvent", id="break_even"),
+        # client-001: income > expenses but low score
+        pytest.param(D_4000, D_3000, 400, "not_solvent", id="client_001"),
+        pytest.param(D_3000, D_2500, 800, "solvent", id="client_002"),
+        # client-003: income > expenses but low score
+        pytest.param(D_6000, D_5500, 0, "not_solvent", id="client_003"),
+        # Exactly at the 700 threshold
+        pytest.param(D_3000, D_2000, 700, "solvent", id="boundary_score_700"),
+    ],
+)
+def test_decide_solvency(monthly_income, monthly_expenses, credit_score, expected):
+    """Test solvent iff score >= 700 and income > expenses"""
     result = SolvencyDecisionService.DecideSolvency(
-        monthly_income=Decimal("3000"),
-        monthly_expenses=Decimal("2000"),
-        credit_score=700,  # Exactly at threshold
+        monthly_income=monthly_income,
+        monthly_expenses=monthly_expenses,
+        credit_score=credit_score,
     )
-    assert result.status == "solvent"
+    assert result.status == expected
 
 
 # ============================================
@@ -181,9 +196,9 @@ def test_explain_generates_three_explanations():
     """Test that Explain returns all three required explanation fields"""
     result = ExplanationService.Explain(
         credit_score=800,
-        monthly_income=Decimal("4000"),
-        monthly_expenses=Decimal("3000"),
-        debt=Decimal("5000"),
+        monthly_income=D_4000,
+        monthly_expenses=D_3000,
+        debt=D_5000,
         late_payments=2,
         has_bankruptcy=False,
     )
@@ -197,9 +212,9 @@ def test_explain_all_fields_non_empty():
     """Test that all explanation fields are non-empty strings"""
     result = ExplanationService.Explain(
         credit_score=500,
-        monthly_income=Decimal("3000"),
-        monthly_expenses=Decimal("3500"),
-        debt=Decimal("10000"),
+        monthly_income=D_3000,
+        monthly_expenses=D_3500,
+        debt=D_10000,
         late_payments=5,
         has_bankruptcy=True,
     )
@@ -214,43 +229,54 @@ def test_explain_excellent_credit_score():
     """Test explanation for excellent credit score (>= 800)"""
     result = ExplanationService.Explain(
         credit_score=850,
-        monthly_income=Decimal("5000"),
-        monthly_expenses=Decimal("3000"),
-        debt=Decimal("0"),
+        monthly_income=D_5000,
+        monthly_expenses=D_3000,
+        debt=D_0,
         late_payments=0,
         has_bankruptcy=False,
     )
 
-    assert (
-        "excellent" in result.credit_score_explanation.lower()
-        or "850" in result.credit_score_explanation
-    )
+    assert _contains_any(result.credit_score_explanation, ("excellent", "850"))
 
 
 def test_explain_poor_credit_score():
     """Test explanation for poor credit score (< 500)"""
     result = ExplanationService.Explain(
         credit_score=300,
-        monthly_income=Decimal("3000"),
-        monthly_expenses=Decimal("2000"),
-        debt=Decimal("15000"),
+        monthly_income=D_3000,
+        monthly_expenses=D_2000,
+        debt=D_15000,
         late_payments=10,
         has_bankruptcy=True,
     )
 
-    assert (
-        "poor" in result.credit_score_explanation.lower()
-        or "300" in result.credit_score_explanation
+    assert _contains_any(result.credit_score_explanation, ("poor", "300"))
+
+
+@pytest.mark.parametrize(
+    "credit_score, band",
+    [(499, "poor"), (500, "fair"), (699, "fair"), (700, "good"), (800, "excellent")],
+)
+def test_explain_score_band_boundaries(credit_score, band):
+    """Test that band thresholds 500/700/800 start the next band"""
+    result = ExplanationService.Explain(
+        credit_score=credit_score,
+        monthly_income=D_3000,
+        monthly_expenses=D_2000,
+        debt=D_0,
+        late_payments=0,
+        has_bankruptcy=False,
     )
+    assert result.credit_score_explanation.lower().startswith(band)
 
 
 def test_explain_positive_cash_flow():
     """Test explanation mentions surplus when income > expenses"""
     result = ExplanationService.Explain(
         credit_score=700,
-        monthly_income=Decimal("5000"),
-        monthly_expenses=Decimal("3000"),
-        debt=Decimal("2000"),
+        monthly_income=D_5000,
+        monthly_expenses=D_3000,
+        debt=D_2000,
         late_payments=0,
         has_bankruptcy=False,
     )
@@ -262,26 +288,23 @@ def test_explain_negative_cash_flow():
     """Test explanation mentions deficit when expenses > income"""
     result = ExplanationService.Explain(
         credit_score=700,
-        monthly_income=Decimal("2000"),
-        monthly_expenses=Decimal("3000"),
-        debt=Decimal("5000"),
+        monthly_income=D_2000,
+        monthly_expenses=D_3000,
+        debt=D_5000,
         late_payments=2,
         has_bankruptcy=False,
     )
 
-    assert (
-        "negative" in result.income_vs_expenses_explanation.lower()
-        or "exceed" in result.income_vs_expenses_explanation.lower()
-    )
+    assert _contains_any(result.income_vs_expenses_explanation, ("negative", "exceed"))
 
 
 def test_explain_bankruptcy_mentioned():
     """Test that bankruptcy is mentioned in credit history explanation"""
     result = ExplanationService.Explain(
         credit_score=400,
-        monthly_income=Decimal("3000"),
-        monthly_expenses=Decimal("2500"),
-        debt=Decimal("10000"),
+        monthly_income=D_3000,
+        monthly_expenses=D_2500,
+        debt=D_10000,
         late_payments=5,
         has_bankruptcy=True,
     )
@@ -293,13 +316,45 @@ def test_explain_no_issues_clean_record():
     """Test explanation for clean credit record"""
     result = ExplanationService.Explain(
         credit_score=1000,
-        monthly_income=Decimal("5000"),
-        monthly_expenses=Decimal("2000"),
-        debt=Decimal("0"),
+        monthly_income=D_5000,
+        monthly_expenses=D_2000,
+        debt=D_0,
         late_payments=0,
         has_bankruptcy=False,
     )
 
     # Should mention no debt, no late payments, no bankruptcy
-    history_lower = result.credit_history_explanation.lower()
-    assert "no" in history_lower or "0" in result.credit_history_explanation
+    assert _contains_any(result.credit_history_explanation, ("no", "0"))
+
+
+# ============================================
+# Tests for CombinedDecisionService
+# ============================================
+
+
+def test_decide_and_explain_matches_separate_calls():
+    """DecideAndExplain returns the same decision and explanations as the two calls"""
+    args = dict(
+        monthly_income=D_3000,
+        monthly_expenses=D_2500,
+        credit_score=800,
+    )
+    history = dict(debt=D_2000, late_payments=0, has_bankruptcy=False)
+
+    result = CombinedDecisionService.DecideAndExplain(**args, **history)
+    status = SolvencyDecisionService.DecideSolvency(**args)
+    explanations = ExplanationService.Explain(**args, **history)
+
+    assert result.solvency_status.status == status.status == "solvent"
+    assert (
+        result.explanations.credit_score_explanation
+        == explanations.credit_score_explanation
+    )
+    assert (
+        result.explanations.income_vs_expenses_explanation
+        == explanations.income_vs_expenses_explanation
+    )
+    assert (
+        result.explanations.credit_history_explanation
+        == explanations.credit_history_explanation
+    )
@@ -0,0 +1,64 @@
+import time
+from loan_solvency_service.shared.cache import NUM_SHARDS, TTLCache
+
+# ============================================
+# Tests for TTLCache
+# ============================================
+
+
+def test_cache_put_and_get():
+    """Stored values are returned until invalidated"""
+    cache = TTLCache(ttl_seconds=60, max_size=100)
+    cache.put("identity:client-001", "John Doe")
+
+    assert cache.get("identity:client-001") == "John Doe"
+    assert cache.invalidate("identity:client-001") is True
+    assert cache.get("identity:client-001") is None
+    assert cache.invalidate("identity:client-001") is False
+
+
+def test_cache_entries_expire():
+    """Entries are dropped once their TTL has passed"""
+    cache = TTLCache(ttl_seconds=0, max_size=100)
+    cache.put("history:client-001", "record")
+    time.sleep(0.01)
+
+    assert cache.get("history:client-001") is None
+
+
+def test_cache_never_exceeds_max_size():
+    """Eviction keeps the cache within max_size across all shards"""
+    cache = TTLCache(ttl_seconds=60, max_size=NUM_SHARDS * 4)
+    for i in range(1000):
+        cache.put(f"identity:client-{i}", i)
+
+    stats = cache.get_stats()
+    assert stats["size"] <= NUM_SHARDS * 4
+    assert stats["evictions"] == 1000 - stats["size"]
+
+
+def test_small_cache_keeps_exact_lru_order():
+    """Below NUM_SHARDS entries the least recently used entry is evicted"""
+    cache = TTLCache(ttl_seconds=60, max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_stats_sum_over_shards():
+    """Hits and misses are counted across all shards"""
+    cache = TTLCache(ttl_seconds=60, max_size=100)
+    for i in range(20):
+        cache.put(f"financials:client-{i:03d}", i)
+    for i in range(30):
+        cache.get(f"financials:client-{i:03d}")
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 20
+    assert stats["misses"] == 10
+    assert stats["hit_rate_percent"] == round(20 / 30 * 100, 2)
@@ -1,7 +1,8 @@
 import pytest
 from decimal import Decimal
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 from loan_solvency_service.shared.db_setup import Base, Client
 from loan_solvency_service.services.crud.ClientDirectoryService import (
     ClientDirectoryService,
@@ -10,7 +11,16 @@ from loan_solvency_service.services.crud.FinancialDataService import (
     FinancialDataService,
 )
 from loan_solvency_service.services.crud.CreditBureauService import CreditBureauService
-from loan_solvency_service.shared.base_service import ClientNotFoundFault
+from loan_solvency_service.shared.base_service import (
+    ClientNotFoundFault,
+    ClientValidationError,
+)
+from loan_solvency_service.shared.client_fetch import (
+    client_scope,
+    get_client,
+    get_client_models,
+    prefetch_clients,
+)
 from loan_solvency_service.shared import db_setup
 
 # Test data matching project requirements
@@ -47,39 +57,72 @@ TEST_CLIENTS = [
     },
 ]
 
+# Test ids for tests parametrized over TEST_CLIENTS
+CLIENT_IDS = [client["client_id"] for client in TEST_CLIENTS]
 
-@pytest.fixture(scope="function")
-def test_db():
+
+@pytest.fixture(scope="session")
+def test_engine():
     """
-    Creates an in-memory SQLite database for isolated testing.
-    Each test gets a fresh database.
+    Creates an in-memory SQLite database once for the whole test run.
+    StaticPool keeps its single connection (and so the data) alive.
     """
-    # Create in-memory SQLite engine
-    engine = create_engine("sqlite:///:memory:")
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # Throwaway database: skip journaling, fsyncs and on-disk temp files
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 
     # Create all tables
     Base.metadata.create_all(engine)
 
-    # Create session factory
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Insert test data (one executemany, no ORM objects)
+    with Session(engine) as session:
+        session.execute(insert(Client), TEST_CLIENTS)
+        session.commit()
 
-    # Override the global SessionLocal used by services
-    original_session = db_setup.SessionLocal
-    db_setup.SessionLocal = TestSessionLocal
+    yield engine
 
-    # Insert test data
-    session = TestSessionLocal()
-    for client_data in TEST_CLIENTS:
-        client = Client(**client_data)
-        session.add(client)
-    session.commit()
-    session.close()
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def test_db(test_engine, monkeypatch):
+    """
+    Runs each test inside a transaction that is rolled back afterwards,
+    so every test sees the same seeded database.
+    """
+    connection = test_engine.connect()
+    transaction = connection.begin()
+
+    # Sessions join the test transaction; their commits become savepoints
+    TestSessionLocal = scoped_session(
+        sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+        )
+    )
+
+    # Override the global SessionLocal used by services (undone by monkeypatch)
+    monkeypatch.setattr(db_setup, "SessionLocal", TestSessionLocal)
 
     yield TestSessionLocal
 
-    # Cleanup: restore original session and close engine
-    db_setup.SessionLocal = original_session
-    engine.dispose()
+    # Cleanup: undo the test's changes
+    TestSessionLocal.remove()
+    transaction.rollback()
+    connection.close()
 
 
 # ============================================
@@ -97,13 +140,12 @@ def test_get_client_identity_success(test_db):
     assert result.address == "123 Main St"
 
 
-def test_get_client_identity_all_clients(test_db):
+@pytest.mark.parametrize("test_client", TEST_CLIENTS, ids=CLIENT_IDS)
+def test_get_client_identity_all_clients(test_db, test_client):
     """Test that all three test clients can be retrieved"""
-    # Test all clients
-    for test_client in TEST_CLIENTS:
-        result = ClientDirectoryService.GetClientIdentity(test_client["client_id"])
-        assert result.name == test_client["name"]
-        assert result.address == test_client["address"]
+    result = ClientDirectoryService.GetClientIdentity(test_client["client_id"])
+    assert result.name == test_client["name"]
+    assert result.address == test_client["address"]
 
 
 def test_get_client_identity_not_found(test_db):
@@ -130,18 +172,18 @@ def test_get_client_financials_success(test_db):
     assert result.monthly_expenses == Decimal("2500.00")
 
 
-def test_get_client_financials_all_clients(test_db):
+@pytest.mark.parametrize("test_client", TEST_CLIENTS, ids=CLIENT_IDS)
+def test_get_client_financials_all_clients(test_db, test_client):
     """Test financial data for all test clients"""
-    for test_client in TEST_CLIENTS:
-        result = FinancialDataService.GetClientFinancials(test_client["client_id"])
-        assert result.monthly_income == test_client["monthly_income"]
-        assert result.monthly_expenses == test_client["monthly_expenses"]
+    result = FinancialDataService.GetClientFinancials(test_client["client_id"])
+    assert result.monthly_income == test_client["monthly_income"]
+    assert result.monthly_expenses == test_client["monthly_expenses"]
 
 
 def test_get_client_financials_not_found(test_db):
     """Test that non-existent client raises ClientNotFoundFault"""
     with pytest.raises(ClientNotFoundFault) as exc_info:
-        FinancialDataService.GetClientFinancials("client-invalid")
+        FinancialDataService.GetClientFinancials("client-998")
 
     assert "not found" in str(exc_info.value).lower()
 
@@ -162,13 +204,13 @@ def test_get_client_credit_history_success(test_db):
     assert result.has_bankruptcy is True
 
 
-def test_get_client_credit_history_all_clients(test_db):
+@pytest.mark.parametrize("test_client", TEST_CLIENTS, ids=CLIENT_IDS)
+def test_get_client_credit_history_all_clients(test_db, test_client):
     """Test credit history for all test clients"""
-    for test_client in TEST_CLIENTS:
-        result = CreditBureauService.GetClientCreditHistory(test_client["client_id"])
-        assert result.debt == test_client["debt"]
-        assert result.late_payments == test_client["late_payments"]
-        assert result.has_bankruptcy == test_client["has_bankruptcy"]
+    result = CreditBureauService.GetClientCreditHistory(test_client["client_id"])
+    assert result.debt == test_client["debt"]
+    assert result.late_payments == test_client["late_payments"]
+    assert result.has_bankruptcy == test_client["has_bankruptcy"]
 
 
 def test_get_client_credit_history_no_bankruptcy(test_db):
@@ -189,6 +231,63 @@ def test_get_client_credit_history_not_found(test_db):
     assert "not found" in str(exc_info.value).lower()
 
 
+# ============================================
+# Tests for the shared client fetch
+# ============================================
+
+
+def test_client_scope_reuses_client_row(test_db):
+    """Within a client scope, the client row is fetched only once"""
+    with client_scope():
+        first = get_client("client-001")
+        second = get_client("client-001")
+
+    assert first is second
+    assert first.name == "John Doe"
+
+
+def test_client_scope_maps_row_once(test_db):
+    """Lookups sharing a row reuse the models mapped from it"""
+    with client_scope():
+        identity = ClientDirectoryService.GetClientIdentity("client-001")
+        financials = FinancialDataService.GetClientFinancials("client-001")
+
+        mapped = get_client_models("client-001")
+
+    assert mapped[0] is identity
+    assert mapped[1] is financials
+    # The memo lives in the scope, not on the ORM row
+    assert not hasattr(get_client("client-001"), "_mapped_models")
+
+
+def test_prefetch_clients_loads_rows_into_scope(test_db, monkeypatch):
+    """Prefetched rows are reused, unknown IDs are remembered as missing"""
+    with client_scope():
+        prefetch_clients(["client-001", "client-002", "client-999"])
+
+        # Rows now come from the scope, even with the database unavailable
+        monkeypatch.setattr(db_setup, "SessionLocal", None)
+        assert get_client("client-001").name == "John Doe"
+        assert get_client("client-002").name == "Alice Smith"
+        assert get_client("client-999") is None
+
+
+def test_nested_client_scope_shares_rows(test_db):
+    """A scope opened inside another one reuses the outer rows"""
+    with client_scope():
+        outer = get_client("client-001")
+        with client_scope():
+            inner = get_client("client-001")
+
+    assert inner is outer
+
+
+def test_get_client_without_scope_fetches_fresh_row(test_db):
+    """Outside a client scope, each lookup queries the database"""
+    assert get_client("client-001") is not get_client("client-001")
+    assert get_client("client-999") is None
+
+
 # ============================================
 # Edge Cases & Data Validation
 # ============================================
@@ -210,6 +309,13 @@ def test_data_types_are_correct(test_db):
     assert isinstance(history.has_bankruptcy, bool)
 
 
+@pytest.mark.parametrize("client_id", ["client-01", "client-0001", "client-001\n"])
+def test_invalid_client_id_rejected(test_db, client_id):
+    """Client IDs must match client-\\d{3} exactly"""
+    with pytest.raises(ClientValidationError):
+        ClientDirectoryService.GetClientIdentity(client_id)
+
+
 def test_decimal_precision(test_db):
     """Verify decimal values maintain correct precision"""
     financials = FinancialDataService.GetClientFinancials("client-002")
@@ -0,0 +1,108 @@
+import pytest
+from prometheus_client import CollectorRegistry
+from prometheus_client import REGISTRY
+from loan_solvency_service.shared.cache import TTLCache
+from loan_solvency_service.shared.metrics import (
+    BulkHistogram,
+    LatencyHistogram,
+    get_metrics_collector,
+)
+
+# ============================================
+# Tests for LatencyHistogram
+# ============================================
+
+
+def test_latency_histogram_empty():
+    """An empty histogram reports zero latencies"""
+    histogram = LatencyHistogram()
+
+    assert histogram.count == 0
+    assert histogram.mean == 0
+    assert histogram.percentile(0.95) == 0
+
+
+def test_latency_histogram_aggregates():
+    """Count, mean, min and max are exact"""
+    histogram = LatencyHistogram()
+    for latency in (4.0, 1.0, 7.0):
+        histogram.record(latency)
+
+    assert histogram.count == 3
+    assert histogram.mean == pytest.approx(4.0)
+    assert histogram.min == 1.0
+    assert histogram.max == 7.0
+
+
+def test_latency_histogram_p95_close_to_exact():
+    """p95 from the buckets stays within a bucket width of the sorted value"""
+    latencies = [0.5 + i * 0.01 for i in range(1000)]
+    histogram = LatencyHistogram()
+    for latency in latencies:
+        histogram.record(latency)
+
+    exact = sorted(latencies)[int(len(latencies) * 0.95)]
+    assert histogram.percentile(0.95) == pytest.approx(exact, rel=0.1)
+
+
+def test_latency_histogram_percentile_within_observed_range():
+    """Interpolation never reports below min or above max"""
+    histogram = LatencyHistogram()
+    for _ in range(10):
+        histogram.record(5.0)
+
+    assert histogram.percentile(0.95) == 5.0
+    assert histogram.percentile(0.01) == 5.0
+
+
+# ============================================
+# Tests for BulkHistogram
+# ============================================
+
+
+def test_bulk_histogram_exports_cumulative_buckets():
+    """Buckets are cumulative, le-inclusive, and samples are scaled"""
+    registry = CollectorRegistry()
+    BulkHistogram(
+        "test_duration_seconds",
+        "Test latency",
+        ["operation"],
+        buckets=[0.01, 0.1],
+        registry=registry,
+    ).observe_many(("Op",), [5.0, 10.0, 50.0, 500.0], scale=0.001)
+
+    def sample(suffix, **labels):
+        return registry.get_sample_value(
+            f"test_duration_seconds{suffix}", {"operation": "Op", **labels}
+        )
+
+    assert sample("_bucket", le="0.01") == 2
+    assert sample("_bucket", le="0.1") == 3
+    assert sample("_bucket", le="+Inf") == 4
+    assert sample("_count") == 4
+    assert sample("_sum") == pytest.approx(0.565)
+
+
+# ============================================
+# Tests for MetricsCollector
+# ============================================
+
+
+def test_cache_stats_exported_per_cache():
+    """Each cache gets its own JSON key and Prometheus cache label"""
+    crud_cache, report_cache = TTLCache(), TTLCache()
+    crud_cache.put("identity:client-001", "row")
+    crud_cache.get("identity:client-001")
+    report_cache.get("client-001")
+
+    collector = get_metrics_collector()
+    metrics = collector.get_metrics(
+        {"crud": crud_cache.get_stats(), "report": report_cache.get_stats()}
+    )
+
+    assert metrics["cache"]["hits"] == 1
+    assert metrics["report_cache"]["misses"] == 1
+
+    labels = {"service": collector.service_name, "cache": "report"}
+    assert REGISTRY.get_sample_value("soap_cache_size", labels) == 0
+    assert REGISTRY.get_sample_value("soap_cache_misses_total", labels) == 1